@@ -1,8 +1,44 @@
+import asyncio
+import atexit
+import base64
+import glob
+import gzip
+import hashlib
+import io
+import itertools
+import logging
+import math
+import mmap
+import mimetypes
+import os
+import pickle
+import shutil
+import struct
+import queue
+import random
+import threading
+import time
+import urllib.parse
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import reduce, wraps
+from operator import and_, or_
+import numpy as np
 import pandas as pd
-import plotly.express as px
-from dash import Dash, html, dcc, dash_table, Input, Output, ctx
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+from dash import Dash, html, dcc, dash_table, Input, Output, State, Patch, ctx, no_update
+from flask import Response, abort, copy_current_request_context, g, has_request_context, request, send_file
+
+try:
+    import brotli # optional: brotli compression of the responses
+except ImportError:
+    brotli = None
 from dash.exceptions import PreventUpdate
-import json # for logging
+import json
 
 
 #########################################################################################################################################################
@@ -10,74 +46,147 @@ import json # for logging
 #########################################################################################################################################################
 
 
-df = pd.read_csv('data/data.csv')
-
-df_coordinates = pd.read_csv('data/word_cloud_coordinates.csv')
-
-df_role_to_achievement = pd.read_csv('data/role-achievement.csv')
-df_role_to_task = pd.read_csv('data/role-task.csv')
-df_role_to_tool = pd.read_csv('data/role-tool.csv')
-df_task_to_achievement = pd.read_csv('data/task-achievement.csv')
-
-
-# Clients table
-df_clients = df[['Client_Order', 'Country', 'Client_Name_Full', 'Project', 'Dates_range', 'NDA', 'Big_five']].drop_duplicates().sort_values(by='Client_Order')
-tooltip_data = []
-for _, row in df_clients.iterrows(): # ToDo
-    tooltip_text = (f"{row['Dates_range']} ({row['Country']})" if row['Client_Name_Full'] != 'various' else f"various dates ({row['Country']})") + "  \n\n" \
-                   + f"**{row['Client_Name_Full'] if not row['NDA'] else ('Client name is protected by NDA' if row['Client_Name_Full'] != 'various' else 'Client names are protected by NDA')}**  \n\n" \
-                   + f"### {'Big Five company' if row['Big_five'] else ''}"
-    tooltip_data.append({
-        col: {"value": tooltip_text, "type": "markdown"}
-        for col in df_clients.columns
-    })
-clients_style = [
-    {"if": {"state": "active"}, "backgroundColor": "lightblue"},
-    {"if": {"state": "selected", "row_index": "odd"}, "backgroundColor": "whitesmoke", "border": "none"},
-    {"if": {"state": "selected", "row_index": "even"}, "backgroundColor": "white", "border": "none"},
-    {"if": {"row_index": "odd"}, "backgroundColor": "whitesmoke"},
-    {"if": {"column_id": "Country"}, "width": "50px"},
-    {"if": {"column_id": "Client_Name_Full"}, "fontSize": "13px", "width": "250px"},
-    {"if": {"column_id": "Project"}, "color": "rgb(85,85,85)", "width": "250px"},
-    {"if": {"filter_query": f'{{Country}} = "Belarus"', "column_id": "Country"}, "color": "rgb(128,176,213)", "fontWeight": "bold", "fontSize": "11px"},
-    {"if": {"filter_query": f'{{Country}} = "USA"', "column_id": "Country"}, "color": "rgb(61,106,152)", "fontWeight": "bold", "fontSize": "11px"},
-]
-clients_orders_list = df["Client_Order"].drop_duplicates().sort_values().tolist()
-
-
-# Gantt
-df_gantt = df[['Client_Order', 'Client_Name_Full', 'Start_Date', 'End_Date', 'Employer', 'Employer_Label', 'Country']].drop_duplicates().sort_values(by='Client_Order', ascending=False)
-df_gantt['Start_Date'] = pd.to_datetime(df_gantt['Start_Date'])
-df_gantt['End_Date'] = pd.to_datetime(df_gantt['End_Date'])
-df_gantt['color'] = df_gantt['Employer'].map({'EPAM Systems': 'rgb(154,154,154)', 'Ernst & Young': 'rgb(205,205,205)'})
-df_gantt['Start_Month'] = df_gantt['Start_Date'].dt.strftime("%b-%Y")
-df_gantt['End_Month'] = df_gantt['End_Date'].dt.strftime("%b-%Y")
-
-all_clients_orders = df[["Client_Order"]].drop_duplicates().sort_values(by='Client_Order', ascending=False).values.tolist()
-
-
-# Roles table
-df_roles = df[['Role', 'Role_Font_Size']].drop_duplicates().sort_values(by='Role')
-roles_style = [
-    {"if": {"filter_query": f'{{Role}} = "{row["Role"]}"'}, "fontSize": f'{row["Role_Font_Size"]}px'}
-    for _, row in df_roles.iterrows()
-]
-roles_style += [
-    {"if": {"state": "active"}, "backgroundColor": "lightblue"},
-    {"if": {"state": "selected"}, "backgroundColor": "white", "border": "none"},
-]
-
-
-# Achievements table
-df_achievements = df[['Achievement', 'Achievement_Priority']].drop_duplicates().sort_values(by='Achievement_Priority')
+def data_hash():
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob("data/*.csv")):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# Compiled fact table: data.csv is stored once as integer codes (one .npy per column) + dimension tables (the distinct values of
+# each text column), memory-mapped at startup instead of parsing the CSV; rebuilt whenever data/*.csv change
+COMPILED_DATA_VERSION = 1
+fact_table_file = "data/data.csv"
+
+
+def compile_fact_table(source, path, version):
+    df_source = pd.read_csv(source)
+    if data_hash() != version:
+        raise ValueError("data/*.csv changed while compiling data.csv") # would be stored under the hash of the previous contents
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(temp_path)
+    columns = []
+    for i, column in enumerate(df_source.columns):
+        values = df_source[column]
+        if values.dtype == object:
+            codes, categories = pd.factorize(values, sort=True) # NaN -> -1
+            np.save(os.path.join(temp_path, f"{i}.npy"), codes.astype(np.min_scalar_type(-len(categories) - 1)))
+            columns.append({"name": column, "categories": categories.tolist()})
+        else:
+            np.save(os.path.join(temp_path, f"{i}.npy"), values.to_numpy())
+            columns.append({"name": column})
+    with open(os.path.join(temp_path, "columns.json"), "w") as f:
+        json.dump(columns, f)
+    try:
+        os.rename(temp_path, path) # atomic; another process may have compiled the same data in the meantime
+    except OSError:
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+
+def load_fact_table(version):
+    path = os.path.join(os.environ.get("CV_SNAPSHOT_DIR", "cache"), f"data-v{COMPILED_DATA_VERSION}-{version[:16]}")
+    if not os.path.exists(os.path.join(path, "columns.json")):
+        compile_fact_table(fact_table_file, path, version)
+    with open(os.path.join(path, "columns.json")) as f:
+        columns = json.load(f)
+    data = {}
+    for i, column in enumerate(columns):
+        values = np.load(os.path.join(path, f"{i}.npy"), mmap_mode="r")
+        if "categories" in column:
+            data[column["name"]] = pd.Categorical.from_codes(values, categories=column["categories"])
+        else:
+            data[column["name"]] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def decoded(df_part):
+    # the (small) tables derived from the fact table get plain values instead of category codes
+    return df_part.astype({column: object for column, dtype in df_part.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)})
+
+
+# Relation index: (dimension, value) -> {related dimension: [related values]}, built once instead of scanning df on every click
+dimensions = ["Client_Order", "Role", "Tool", "Task", "Achievement"]
+bridge_table_files = { # these pairs are answered from the bridge tables instead of the fact table
+    ("Role", "Achievement"): "data/role-achievement.csv",
+    ("Role", "Task"): "data/role-task.csv",
+    ("Role", "Tool"): "data/role-tool.csv",
+    ("Tool", "Role"): "data/role-tool.csv",
+    ("Task", "Achievement"): "data/task-achievement.csv",
+    ("Achievement", "Task"): "data/task-achievement.csv",
+}
 
 
-# Tasks table
-df_tasks = df[['Task', 'Task_Priority']].drop_duplicates().sort_values(by='Task_Priority')
+def read_bridge_table(path):
+    # the bridge tables spell some values with a trailing space (e.g. a task in role-task.csv): stripped, so that they match the
+    # values of the fact table, which the tables of the views are built from
+    df_bridge = pd.read_csv(path)
+    return df_bridge.apply(lambda values: values.str.strip() if values.name in dimensions and values.dtype == object else values)
+
+
+def build_relation_index(df, bridge_tables):
+    index = {}
+    for dimension in dimensions:
+        for related_dimension in dimensions:
+            source = bridge_tables.get((dimension, related_dimension), df)
+            if dimension == related_dimension:
+                pairs = source[[dimension]].dropna().drop_duplicates().assign(related=source[dimension])
+            else:
+                pairs = source[[dimension, related_dimension]].dropna().drop_duplicates().rename(columns={related_dimension: "related"})
+            # related values keep the order of their first appearance in the source table
+            for value, related_values in pairs.groupby(dimension, sort=False, observed=True)["related"]:
+                index.setdefault((dimension, value), {})[related_dimension] = related_values.tolist()
+    return index
+
+
+# Compound selections (several items selected at once): the relations of every (dimension, value) are also kept as bitmaps over
+# the values of each related dimension (Python ints, bit i = the i-th value in table order), so that the values related to all
+# ("and") / any ("or") of the selected items take one bitwise operation per item instead of set operations over value lists
+Selection = namedtuple("Selection", ["operator", "items"]) # "and" / "or", ((dimension, value), ...)
+
+
+def build_bitmap_index(relation_index, table_values):
+    # -> values of every dimension by position, value -> position, and (dimension, value) -> {related dimension: bitmap}
+    # positions of the values of every dimension: table order, then the values found only in the relations
+    bitmap_positions = {dimension: {} for dimension in table_values}
+    for dimension, values in table_values.items():
+        for value in values:
+            bitmap_positions[dimension].setdefault(value, len(bitmap_positions[dimension]))
+    for related_values in relation_index.values():
+        for related_dimension, values in related_values.items():
+            for value in values:
+                bitmap_positions[related_dimension].setdefault(value, len(bitmap_positions[related_dimension]))
+    bitmap_values = {dimension: list(positions) for dimension, positions in bitmap_positions.items()}
+    bitmap_index = {
+        key: {
+            related_dimension: reduce(or_, (1 << bitmap_positions[related_dimension][value] for value in values), 0)
+            for related_dimension, values in related_values.items()
+        }
+        for key, related_values in relation_index.items()
+    }
+    return bitmap_values, bitmap_positions, bitmap_index
+
+
+def selected_values(selection, related_dimension):
+    # values of related_dimension related to all / any of the selected items (in table order), plus the selected items of that dimension
+    data = dataset()
+    bitmaps = [data.bitmap_index.get(item, {}).get(related_dimension, 0) for item in selection.items]
+    bitmap = reduce(and_ if selection.operator == "and" else or_, bitmaps) if bitmaps else 0
+    positions = data.bitmap_positions[related_dimension]
+    for dimension, value in selection.items:
+        if dimension == related_dimension and value in positions:
+            bitmap |= 1 << positions[value]
+    values = data.bitmap_values[related_dimension]
+    return [values[position] for position, bit in enumerate(reversed(f"{bitmap:b}")) if bit == "1"]
+
+
+def related(dimension, value, related_dimension):
+    if dimension == "Selection": # a compound selection
+        return selected_values(value, related_dimension)
+    return dataset().relation_index.get((dimension, value), {}).get(related_dimension, [])
 
 
-# Word clous
-df_tools = df[["Tool", "Tool_Type", "Tool_Size"]].drop_duplicates()
 tool_type_colors = {
     "BI": "rgb(200,82,0)",
     "data": "rgb(245,156,60)",
@@ -90,11 +199,304 @@ tool_type_colors_2 = {
     "language": "rgb(241,241,241)",
     "misc": "rgb(248,248,248)"
 }
-df_tools["Color"] = df_tools["Tool_Type"].map(tool_type_colors).fillna("black")
-df_tools = df_tools.merge(df_coordinates, on="Tool", how="left")
-size_min, size_max = 10, 24
-tool_sizes = df_tools["Tool_Size"]
-df_tools["Font_Size"] = ((tool_sizes - tool_sizes.min()) / (tool_sizes.max() - tool_sizes.min()) * (size_max - size_min)) + size_min # ToDo
+
+
+# Word cloud layout: tools without a hand-placed position in word_cloud_coordinates.csv are placed automatically, largest first,
+# at the first point of a spiral around the center where the word's box overlaps no other word (hand-placed ones included);
+# if there is none, at the point of the spiral where it overlaps the least. Placed boxes are kept in a uniform grid, so that a
+# collision check only looks at the boxes in the cells the candidate covers.
+WORD_CLOUD_LAYOUT_VERSION = 2
+word_cloud_plot_size = (630, 280) # px, the word cloud figure minus its margins; positions are in 0..1 of the plot area (the axis ranges)
+
+
+def word_box(x, y, tool, font_size):
+    # (x0, y0, x1, y1) in px of the word centered at (x, y), estimated from the font size
+    width, height = len(tool) * font_size * 0.6, font_size * 1.3
+    return x - width / 2, y - height / 2, x + width / 2, y + height / 2
+
+
+class BoxGrid:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {} # (column, row) -> boxes overlapping the cell
+
+    def _cells(self, box):
+        x0, y0, x1, y1 = box
+        return [
+            (i, j)
+            for i in range(int(x0 // self.cell_size), int(x1 // self.cell_size) + 1)
+            for j in range(int(y0 // self.cell_size), int(y1 // self.cell_size) + 1)
+        ]
+
+    def collides(self, box):
+        x0, y0, x1, y1 = box
+        for cell in self._cells(box):
+            for other in self.cells.get(cell, ()):
+                if x0 < other[2] and other[0] < x1 and y0 < other[3] and other[1] < y1:
+                    return True
+        return False
+
+    def overlap(self, box):
+        # total area in px² of the box's overlaps with the other boxes
+        x0, y0, x1, y1 = box
+        others = {id(other): other for cell in self._cells(box) for other in self.cells.get(cell, ())} # a box is in all the cells it covers
+        return sum(max(0, min(x1, other[2]) - max(x0, other[0])) * max(0, min(y1, other[3]) - max(y0, other[1])) for other in others.values())
+
+    def add(self, box):
+        for cell in self._cells(box):
+            self.cells.setdefault(cell, []).append(box)
+
+
+def place_words(words, fixed):
+    # words: [(tool, font size)] to place; fixed: [(tool, font size, x, y)] hand-placed; returns {tool: (x, y)}
+    width, height = word_cloud_plot_size
+    grid = BoxGrid(cell_size=max([font_size for _, font_size in words] + [10]) * 1.3)
+    for tool, font_size, x, y in fixed:
+        grid.add(word_box(x * width, y * height, tool, font_size))
+
+    spiral = []
+    for step in itertools.count():
+        angle = step * 0.1
+        radius = 2 * angle
+        if radius > height * 0.75: # the spiral has left the plot area
+            break
+        spiral.append((width / 2 + radius * math.cos(angle) * width / height, height / 2 + radius * math.sin(angle)))
+
+    positions = {}
+    for tool, font_size in sorted(words, key=lambda word: -word[1]):
+        candidates = [(x, y, word_box(x, y, tool, font_size)) for x, y in spiral]
+        candidates = [(x, y, box) for x, y, box in candidates if box[0] >= 0 and box[1] >= 0 and box[2] <= width and box[3] <= height]
+        free = next(((x, y, box) for x, y, box in candidates if not grid.collides(box)), None)
+        # no free point: the least overlapping one rather than drop the word (the center if the word is wider than the plot)
+        x, y, box = free or min(candidates, key=lambda candidate: grid.overlap(candidate[2]), default=(width / 2, height / 2, word_box(width / 2, height / 2, tool, font_size)))
+        grid.add(box)
+        positions[tool] = (x / width, y / height)
+    return positions
+
+
+def word_positions(df_tools):
+    # x_pos / y_pos of every tool: the hand-placed ones if any, else computed (and cached on disk, keyed by the tool set)
+    missing = df_tools["x_pos"].isna() | df_tools["y_pos"].isna()
+    if not missing.any():
+        return df_tools
+    words = [(tool, float(font_size)) for tool, font_size in df_tools.loc[missing, ["Tool", "Font_Size"]].itertuples(index=False)]
+    fixed = [
+        (tool, float(font_size), float(x), float(y))
+        for tool, font_size, x, y in df_tools.loc[~missing, ["Tool", "Font_Size", "x_pos", "y_pos"]].itertuples(index=False)
+    ]
+
+    key = hashlib.sha256(json.dumps([WORD_CLOUD_LAYOUT_VERSION, word_cloud_plot_size, words, fixed]).encode()).hexdigest()
+    path = os.path.join(os.environ.get("CV_SNAPSHOT_DIR", "cache"), f"word-cloud-layout-v{WORD_CLOUD_LAYOUT_VERSION}-{key[:16]}.json")
+    try:
+        with open(path) as f:
+            positions = json.load(f)
+    except (OSError, ValueError):
+        positions = place_words(words, fixed)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(f"{path}.{os.getpid()}.tmp", "w") as f:
+            json.dump(positions, f)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+    df_tools = df_tools.copy()
+    df_tools.loc[missing, "x_pos"] = [positions[tool][0] for tool, _ in words]
+    df_tools.loc[missing, "y_pos"] = [positions[tool][1] for tool, _ in words]
+    return df_tools
+
+
+# Compact highlighting (see table_highlight): the tables highlight rows with a constant number of style rules
+COMPACT_HIGHLIGHT = os.environ.get("CV_COMPACT_HIGHLIGHT") == "1" and os.environ.get("CV_CLIENTSIDE") != "1"
+
+
+class Dataset:
+    """Immutable snapshot of the data and of everything derived from it. A reload builds a new one and swaps it in whole."""
+
+    def __init__(self, **tables):
+        self.__dict__.update(tables)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Dataset is immutable, cannot set {name}")
+
+
+def load_dataset():
+    version = data_hash()
+    df = load_fact_table(version)
+
+    df_coordinates = pd.read_csv('data/word_cloud_coordinates.csv')
+
+    bridge_tables = {pair: read_bridge_table(path) for pair, path in bridge_table_files.items()}
+
+    relation_index = build_relation_index(df, bridge_tables)
+
+
+    # Clients table
+    df_clients = decoded(df[['Client_Order', 'Country', 'Client_Name_Full', 'Project', 'Dates_range', 'NDA', 'Big_five']].drop_duplicates()).sort_values(by='Client_Order')
+    # one markdown tooltip per client row (in df_clients order), applied to all of the row's cells in the layout
+    various = df_clients['Client_Name_Full'] == 'various'
+    dates = (df_clients['Dates_range'] + " (" + df_clients['Country'] + ")").where(~various, "various dates (" + df_clients['Country'] + ")")
+    nda_name = pd.Series(np.where(various, 'Client names are protected by NDA', 'Client name is protected by NDA'), index=df_clients.index)
+    client_name = df_clients['Client_Name_Full'].where(~df_clients['NDA'].astype(bool), nda_name)
+    big_five = pd.Series(np.where(df_clients['Big_five'].astype(bool), 'Big Five company', ''), index=df_clients.index)
+    client_tooltips = (dates + "  \n\n**" + client_name + "**  \n\n### " + big_five).tolist()
+    clients_style = [
+        {"if": {"state": "active"}, "backgroundColor": "lightblue"},
+        {"if": {"state": "selected", "row_index": "odd"}, "backgroundColor": "whitesmoke", "border": "none"},
+        {"if": {"state": "selected", "row_index": "even"}, "backgroundColor": "white", "border": "none"},
+        {"if": {"row_index": "odd"}, "backgroundColor": "whitesmoke"},
+        {"if": {"column_id": "Country"}, "width": "50px"},
+        {"if": {"column_id": "Client_Name_Full"}, "fontSize": "13px", "width": "250px"},
+        {"if": {"column_id": "Project"}, "color": "rgb(85,85,85)", "width": "250px"},
+        {"if": {"filter_query": f'{{Country}} = "Belarus"', "column_id": "Country"}, "color": "rgb(128,176,213)", "fontWeight": "bold", "fontSize": "11px"},
+        {"if": {"filter_query": f'{{Country}} = "USA"', "column_id": "Country"}, "color": "rgb(61,106,152)", "fontWeight": "bold", "fontSize": "11px"},
+    ]
+    clients_orders_list = df["Client_Order"].drop_duplicates().sort_values().tolist()
+
+
+    # Gantt
+    df_gantt = decoded(df[['Client_Order', 'Client_Name_Full', 'Start_Date', 'End_Date', 'Employer', 'Employer_Label', 'Country']].drop_duplicates()).sort_values(by='Client_Order', ascending=False)
+    df_gantt['Start_Date'] = pd.to_datetime(df_gantt['Start_Date'])
+    df_gantt['End_Date'] = pd.to_datetime(df_gantt['End_Date'])
+    df_gantt['color'] = df_gantt['Employer'].map({'EPAM Systems': 'rgb(154,154,154)', 'Ernst & Young': 'rgb(205,205,205)'})
+    df_gantt['Start_Month'] = df_gantt['Start_Date'].dt.strftime("%b-%Y")
+    df_gantt['End_Month'] = df_gantt['End_Date'].dt.strftime("%b-%Y")
+    gantt_clients_list = list(dict.fromkeys(df_gantt["Client_Name_Full"].tolist()[::-1]))
+
+    all_clients_orders = df["Client_Order"].drop_duplicates().sort_values(ascending=False).tolist()
+
+    # Gantt bar columns in their serialized form
+    gantt_columns = {
+        "base": np.datetime_as_string(df_gantt["Start_Date"].to_numpy(dtype="datetime64[ns]")),
+        "x": ((df_gantt["End_Date"] - df_gantt["Start_Date"]) // pd.Timedelta(milliseconds=1)).to_numpy(), # bar length in ms
+        "y": df_gantt["Client_Name_Full"].to_numpy(dtype=object),
+        "text": df_gantt["Employer_Label"].astype(object).where(df_gantt["Employer_Label"].notna(), None).to_numpy(),
+    }
+    gantt_customdata = df_gantt[["Start_Month", "End_Month", "Country", "Employer", "Client_Name_Full"]].to_numpy(dtype=object).tolist()
+
+
+    # Roles table
+    df_roles = decoded(df[['Role', 'Role_Font_Size']].drop_duplicates()).sort_values(by='Role')
+    if COMPACT_HIGHLIGHT: # one row_index rule per font size instead of one filter_query rule per role
+        role_font_sizes = df_roles["Role_Font_Size"].tolist()
+        roles_style = [
+            {"if": {"row_index": [row for row, row_size in enumerate(role_font_sizes) if row_size == size]}, "fontSize": f"{size}px"}
+            for size in dict.fromkeys(role_font_sizes)
+        ]
+    else:
+        roles_style = [
+            {"if": {"filter_query": f'{{Role}} = "{row["Role"]}"'}, "fontSize": f'{row["Role_Font_Size"]}px'}
+            for _, row in df_roles.iterrows()
+        ]
+    roles_style += [
+        {"if": {"state": "active"}, "backgroundColor": "lightblue"},
+        {"if": {"state": "selected"}, "backgroundColor": "white", "border": "none"},
+    ]
+
+
+    # Achievements table
+    df_achievements = decoded(df[['Achievement', 'Achievement_Priority']].drop_duplicates()).sort_values(by='Achievement_Priority')
+
+
+    # Tasks table
+    df_tasks = decoded(df[['Task', 'Task_Priority']].drop_duplicates()).sort_values(by='Task_Priority')
+
+
+    # Word clous
+    df_tools = decoded(df[["Tool", "Tool_Type", "Tool_Size"]].drop_duplicates())
+    df_tools["Color"] = df_tools["Tool_Type"].map(tool_type_colors).fillna("black")
+    df_tools["Color_Highlighted"] = df_tools["Tool_Type"].map(tool_type_colors)
+    df_tools["Color_Dimmed"] = df_tools["Tool_Type"].map(tool_type_colors_2)
+    df_tools = df_tools.merge(df_coordinates, on="Tool", how="left")
+    size_min, size_max = 10, 24
+    tool_sizes = df_tools["Tool_Size"]
+    df_tools["Font_Size"] = ((tool_sizes - tool_sizes.min()) / (tool_sizes.max() - tool_sizes.min()) * (size_max - size_min)) + size_min # ToDo
+    df_tools = word_positions(df_tools)
+
+
+    # Achievements / Tasks tables in the paging mode: row positions of the values, and sort keys (the rank of every row in each
+    # column, equal values with equal ranks) so that sorting a filtered index is an integer sort
+    row_positions = {}
+    sort_keys = {}
+    for dimension, df_table in [("Achievement", df_achievements), ("Task", df_tasks)]:
+        row_positions[dimension] = {value: position for position, value in reversed(list(enumerate(df_table[dimension].tolist())))}
+        sort_keys[dimension] = {
+            column: df_table[column].rank(method="dense", na_option="bottom").to_numpy(dtype=np.int64)
+            for column in df_table.columns
+        }
+
+
+    # compact highlighting: row positions of the Projects / Roles values
+    for dimension, df_table in [("Client_Order", df_clients), ("Role", df_roles)]:
+        row_positions[dimension] = {value: position for position, value in reversed(list(enumerate(df_table[dimension].tolist())))}
+
+
+    # compound selections: relation bitmaps over the values of every dimension, in the order of its table
+    bitmap_values, bitmap_positions, bitmap_index = build_bitmap_index(relation_index, {
+        "Client_Order": clients_orders_list,
+        "Role": df_roles["Role"].tolist(),
+        "Tool": df_tools["Tool"].tolist(),
+        "Task": df_tasks["Task"].tolist(),
+        "Achievement": df_achievements["Achievement"].dropna().tolist(),
+    })
+
+
+    # highlightable items of every view: view -> (key dimension, categorical keys in the view's order)
+    highlight_views = {
+        "gantt_bars": ("Client_Order", df_gantt["Client_Order"].astype("category")),
+        "gantt_rows": ("Client_Order", pd.Series(all_clients_orders[:len(gantt_clients_list)], dtype="category")),
+        "word_cloud": ("Tool", df_tools["Tool"].astype("category")),
+    }
+
+    return Dataset(
+        version=version, # hash of data/*.csv
+        df=df,
+        relation_index=relation_index,
+        df_clients=df_clients,
+        client_tooltips=client_tooltips,
+        clients_style=clients_style,
+        clients_orders_list=clients_orders_list,
+        df_gantt=df_gantt,
+        gantt_clients_list=gantt_clients_list,
+        all_clients_orders=all_clients_orders,
+        gantt_columns=gantt_columns,
+        gantt_customdata=gantt_customdata,
+        df_roles=df_roles,
+        roles_style=roles_style,
+        df_achievements=df_achievements,
+        df_tasks=df_tasks,
+        df_tools=df_tools,
+        row_positions=row_positions,
+        sort_keys=sort_keys,
+        highlight_views=highlight_views,
+        bitmap_values=bitmap_values,
+        bitmap_positions=bitmap_positions,
+        bitmap_index=bitmap_index,
+        precomputed_outputs={}, # (source, selected value, active cell row) -> outputs tuple, filled in the precompute mode
+        rendered={}, # renderings of this snapshot that are built once, e.g. the layout
+    )
+
+
+current_dataset = load_dataset()
+building = threading.local() # the snapshot that a reload is building / validating on this thread, before it is swapped in
+
+
+def dataset():
+    # the snapshot to read from: a request keeps the one it started with, so a concurrent reload never mixes two in one response
+    pinned = getattr(building, "dataset", None)
+    if pinned is not None:
+        return pinned
+    if not has_request_context():
+        return current_dataset
+    if "dataset" not in g:
+        g.dataset = current_dataset
+    return g.dataset
+
+
+@contextmanager
+def using(data):
+    building.dataset = data
+    try:
+        yield data
+    finally:
+        building.dataset = None
 
 
 #########################################################################################################################################################
@@ -102,61 +504,368 @@ df_tools["Font_Size"] = ((tool_sizes - tool_sizes.min()) / (tool_sizes.max() - t
 #########################################################################################################################################################
 
 
-def create_wordcloud(selected_client_order=None, selected_role=None, selected_tool=None, selected_task=None, selected_achievement=None):
-    df_plot = df_tools.copy()
+class FigureCache:
+    """Bounded LRU cache of serialized figures, keyed by the data version, the figure function and the selection it was built for."""
 
-    # dim colors for the unrelated items (if any)
-    if selected_client_order is not None: # if triggered by the User clicking on the Clients table
-        related_tools = df[df["Client_Order"] == selected_client_order]["Tool"].drop_duplicates().tolist()
-        df_plot["Color"] = df_plot.apply(
-            lambda row:
-            tool_type_colors[row["Tool_Type"]] if row["Tool"] in related_tools
-            else
-            tool_type_colors_2[row["Tool_Type"]],
-            axis=1
-        )
-    elif selected_role is not None: # if triggered by the User clicking on the Roles table
-        related_tools = df_role_to_tool[df_role_to_tool["Role"] == selected_role]["Tool"].drop_duplicates().tolist()
-        df_plot["Color"] = df_plot.apply(
-            lambda row:
-            tool_type_colors[row["Tool_Type"]] if row["Tool"] in related_tools
-            else
-            tool_type_colors_2[row["Tool_Type"]],
-            axis=1
-        )
-    elif selected_tool is not None: # if triggered by the User clicking on the Word cloud
-        df_plot["Color"] = df_plot.apply(
-            lambda row:
-            tool_type_colors[row["Tool_Type"]] if row["Tool"] == selected_tool
-            else
-            tool_type_colors_2[row["Tool_Type"]],
-            axis=1
-        )
-        df_plot["Font_Size"] = df_plot.apply(
-            lambda row:
-            row["Font_Size"] + 2 if row["Tool"] == selected_tool
-            else
-            row["Font_Size"],
-            axis=1
-        )
-    elif selected_task is not None: # if triggered by the User clicking on the Tasks table
-        related_tools = df[df["Task"] == selected_task]["Tool"].drop_duplicates().tolist()
-        df_plot["Color"] = df_plot.apply(
-            lambda row:
-            tool_type_colors[row["Tool_Type"]] if row["Tool"] in related_tools
-            else
-            tool_type_colors_2[row["Tool_Type"]],
-            axis=1
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return json.loads(self._figures[key])
+            self.misses += 1
+
+        figure_json = to_json_plotly(build()) # built outside the lock, so concurrent misses do not wait for each other
+
+        with self._lock:
+            if self.maxsize > 0:
+                self._figures[key] = figure_json
+                self._figures.move_to_end(key)
+                while len(self._figures) > self.maxsize:
+                    self._figures.popitem(last=False)
+                    self.evictions += 1
+        return json.loads(figure_json)
+
+    def invalidate(self, keep_version=None):
+        # drop all figures, or all but those built from the given data version
+        with self._lock:
+            for key in [key for key in self._figures if key[0] != keep_version]:
+                del self._figures[key]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._figures), "maxsize": self.maxsize}
+
+
+figure_cache = FigureCache(maxsize=int(os.environ.get("CV_FIGURE_CACHE_SIZE", 256))) # 0 disables caching
+validation_figures = FigureCache(maxsize=0) # the figures of a snapshot being validated: serialized, not kept (see DATA RELOAD)
+
+
+class Superseded(PreventUpdate):
+    """A crossfilter request superseded by a newer click in the same page view: its response would be discarded, so it stops early."""
+
+
+class RequestGenerations:
+    """Generation counter of the crossfilter requests per page view, in memory shared with the forked worker processes.
+
+    A page view hashes to one of `slots` 64-bit slots holding a tag (other bits of its hash) and its latest generation, read and
+    written as one aligned word (no lock, across threads and processes). A page view that finds its slot taken by another one
+    (different tag) takes it over; a request whose slot was taken over is never superseded, so a collision only loses coalescing.
+    Two clicks of one page view starting at the same moment may get the same generation: neither is superseded.
+    """
+
+    generation_bits = 24 # generations are compared for equality only, so they may wrap around
+
+    def __init__(self, slots):
+        self.slots = slots
+        self._memory = mmap.mmap(-1, slots * 8) # anonymous, shared with the processes forked after this (gunicorn --preload)
+        self._latest = np.frombuffer(self._memory, dtype=np.uint64)
+
+    def _slot_and_tag(self, page_view):
+        digest = int.from_bytes(hashlib.blake2b(page_view.encode(), digest_size=8).digest(), "little")
+        return digest % self.slots, digest >> self.generation_bits # the tag fits in the bits above the generation
+
+    def start(self, page_view):
+        slot, tag = self._slot_and_tag(page_view)
+        latest = int(self._latest[slot])
+        generation = (latest + 1 if latest >> self.generation_bits == tag else 1) & ((1 << self.generation_bits) - 1)
+        self._latest[slot] = tag << self.generation_bits | generation
+        return generation
+
+    def is_latest(self, page_view, generation):
+        slot, tag = self._slot_and_tag(page_view)
+        latest = int(self._latest[slot])
+        return latest >> self.generation_bits != tag or latest & ((1 << self.generation_bits) - 1) == generation
+
+
+request_generations = RequestGenerations(slots=1 << 16)
+
+
+def check_superseded():
+    # called before the expensive steps of a crossfilter request (handlers, figures): stop if a newer click of the same page
+    # view has started since (see COALESCING)
+    if has_request_context() and g.get("generation") is not None and not request_generations.is_latest(*g.generation):
+        callback_metrics.count_superseded(g.get("callback_trigger", "none"))
+        raise Superseded
+
+
+def cached_figure(create_figure):
+    @wraps(create_figure)
+    def wrapper(**selection):
+        check_superseded()
+        key = (dataset().version, create_figure.__name__, tuple(sorted((name, value) for name, value in selection.items() if value is not None)))
+        cache = figure_cache if getattr(building, "dataset", None) is None else validation_figures
+        return cache.get_or_build(key, lambda: create_figure(**selection))
+    return wrapper
+
+
+selection_dimensions = {"selected_client_order": "Client_Order", "selected_role": "Role", "selected_tool": "Tool", "selected_task": "Task", "selected_achievement": "Achievement", "selected_items": "Selection"}
+
+
+def selection_of(selected_client_order=None, selected_role=None, selected_tool=None, selected_task=None, selected_achievement=None, selected_items=None):
+    # (dimension, value) of the selection, in the order of precedence of the arguments; (None, None) if nothing is selected
+    # (selected_items is a compound Selection)
+    for dimension, value in zip(selection_dimensions.values(), (selected_client_order, selected_role, selected_tool, selected_task, selected_achievement, selected_items)):
+        if value is not None:
+            return dimension, value
+    return None, None
+
+
+def highlight_mask(view, dimension, value):
+    # boolean mask over the items of the view that are related to the (dimension, value) selection
+    key_dimension, keys = dataset().highlight_views[view]
+    if dimension is None:
+        return np.zeros(len(keys), dtype=bool)
+    related_codes = keys.cat.categories.get_indexer(related(dimension, value, key_dimension))
+    return np.isin(keys.cat.codes.to_numpy(), related_codes[related_codes >= 0])
+
+
+def wordcloud_highlighting(dimension=None, value=None):
+    # word colors and font sizes (in df_tools order): unrelated items are dimmed, the selected tool(s) (if any) are enlarged
+    df_tools = dataset().df_tools
+    if dimension is None:
+        return df_tools["Color"].to_numpy(), df_tools["Font_Size"].to_numpy()
+    mask = highlight_mask("word_cloud", dimension, value)
+    colors = np.where(mask, df_tools["Color_Highlighted"].to_numpy(), df_tools["Color_Dimmed"].to_numpy())
+    if dimension == "Tool":
+        font_sizes = df_tools["Font_Size"].to_numpy() + 2 * mask
+    elif dimension == "Selection":
+        font_sizes = df_tools["Font_Size"].to_numpy() + 2 * df_tools["Tool"].isin([tool for item_dimension, tool in value.items if item_dimension == "Tool"]).to_numpy()
+    else:
+        font_sizes = df_tools["Font_Size"].to_numpy()
+    return colors, font_sizes
+
+
+def gantt_row_shape(row, fillcolor):
+    return {
+        "type": "rect",
+        "xref": "paper",
+        "yref": "y",
+        "x0": 0,
+        "x1": 1,
+        "y0": row - 0.5,
+        "y1": row + 0.5,
+        "fillcolor": fillcolor,
+        "layer": "below",
+        "line": {"width": 0}
+    }
+
+
+# CV_GANTT_BANDS=merged draws the row banding and highlights as at most one path shape per fill color (a rectangle per run of
+# contiguous rows) instead of one or two rect shapes per row, so the number of shapes plotly.js renders and relayouts stays
+# constant as clients are added. The fills stacked on a row are composited into one color, so the rendering is the same.
+# (A background bar trace would be drawn above the white x-axis grid lines, which the "below" shapes are not.)
+MERGED_BANDS = os.environ.get("CV_GANTT_BANDS") == "merged"
+
+
+def composite(fills):
+    # "over" alpha compositing of the rgba fills stacked on a row (bottom first), as a single rgba color
+    red = green = blue = alpha = 0.0
+    for fill in fills:
+        *channels, opacity = (float(channel) for channel in fill[fill.index("(") + 1:-1].split(","))
+        composited = opacity + alpha * (1 - opacity)
+        red, green, blue = (
+            (channel * opacity + below * alpha * (1 - opacity)) / composited for channel, below in zip(channels, (red, green, blue))
         )
-    elif selected_achievement is not None:  # if triggered by the User clicking on the Tasks table
-        related_tools = df[df["Achievement"] == selected_achievement]["Tool"].drop_duplicates().tolist()
-        df_plot["Color"] = df_plot.apply(
-            lambda row:
-            tool_type_colors[row["Tool_Type"]] if row["Tool"] in related_tools
-            else
-            tool_type_colors_2[row["Tool_Type"]],
-            axis=1
-    )
+        alpha = composited
+    return f"rgba({red:g}, {green:g}, {blue:g}, {alpha:g})"
+
+
+def merged_row_shapes(shapes):
+    # row shapes (in drawing order) -> one path shape per composited row color, with a rectangle per run of contiguous rows
+    stacked = {}
+    for shape in shapes:
+        stacked.setdefault(int(shape["y0"] + 0.5), []).append(shape["fillcolor"])
+    runs = {}
+    for row in sorted(stacked):
+        fill_runs = runs.setdefault(composite(stacked[row]), [])
+        if fill_runs and fill_runs[-1][1] == row - 1:
+            fill_runs[-1][1] = row
+        else:
+            fill_runs.append([row, row])
+    return [
+        {
+            "type": "path",
+            "xref": "paper",
+            "yref": "y",
+            "path": "".join(f"M0,{first - 0.5}H1V{last + 0.5}H0Z" for first, last in fill_runs),
+            "fillcolor": fill,
+            "layer": "below",
+            "line": {"width": 0}
+        }
+        for fill, fill_runs in runs.items()
+    ]
+
+
+def gantt_highlighting(dimension=None, value=None):
+    data = dataset()
+
+    # bar colors (in df_gantt order): darker gray for the highlighted bars
+    colors = np.where(highlight_mask("gantt_bars", dimension, value), "dimgray", data.df_gantt["color"].to_numpy())
+
+    # row shapes: blue highlight on selection (if any) + row banding (default)
+    rows = np.arange(len(data.gantt_clients_list))
+    banded = rows % 2 == 0
+    if dimension == "Client_Order": # if triggered by the User clicking on the Clients table
+        client_highlighted = rows == len(data.gantt_clients_list) - data.clients_orders_list.index(value) - 1
+        related_highlighted = None
+    else: # if triggered by the User clicking on the Roles/Tools/Tasks/Achievements table (if any)
+        client_highlighted = np.zeros(len(rows), dtype=bool)
+        related_highlighted = highlight_mask("gantt_rows", dimension, value) if dimension is not None else None
+
+    shapes = []
+    for row in rows.tolist():
+        if client_highlighted[row]:
+            shapes.append(gantt_row_shape(row, "rgba(173, 216, 230, 1)"))
+        elif banded[row]: # above is blue highlighting if any (from callbacks), which overrides the default row banding (below)
+            shapes.append(gantt_row_shape(row, "rgba(240, 240, 240, 0.5)"))
+        if related_highlighted is not None:
+            if related_highlighted[row]:
+                shapes.append(gantt_row_shape(row, "rgba(173, 216, 230, 1)"))
+            elif banded[row]:
+                shapes.append(gantt_row_shape(row, "rgba(240, 240, 240, 0.5)"))
+
+    return colors, merged_row_shapes(shapes) if MERGED_BANDS else shapes
+
+
+# Figures are built as plain dicts (the JSON plotly.py would produce), without plotly.express: importing it takes longer than
+# the rest of the app's imports of plotly, and px.timeline / px.scatter reshape the data frame on every call.
+# CV_PLOTLY_EXPRESS=1 builds them with plotly.express instead (the reference the dicts are checked against).
+PLOTLY_EXPRESS = os.environ.get("CV_PLOTLY_EXPRESS") == "1"
+
+figure_template = json.loads(to_json_plotly(pio.templates[pio.templates.default]))
+
+
+def typed_array(values):
+    # float array in the base64-encoded typed array format that plotly.py serializes numpy arrays to
+    return {"dtype": "f8", "bdata": base64.b64encode(np.ascontiguousarray(values, dtype="<f8").tobytes()).decode("ascii")}
+
+
+def hidden_axis(title):
+    return {
+        "anchor": "y" if title == "x_pos" else "x",
+        "domain": [0.0, 1.0],
+        "title": {"text": title},
+        "showgrid": False,
+        "showticklabels": False,
+        "zeroline": False,
+        "fixedrange": True,
+        "range": [0, 1], # the plot area the word cloud layout is computed for (word_cloud_plot_size), not autoranged
+        "visible": False
+    }
+
+
+def wordcloud_figure(colors, font_sizes):
+    df_tools = dataset().df_tools
+    trace = {
+        "hovertemplate": "%{text}",
+        "legendgroup": "",
+        "marker": {"color": "#636efa", "symbol": "circle"},
+        "mode": "text",
+        "name": "",
+        "orientation": "v",
+        "showlegend": False,
+        "text": df_tools["Tool"].tolist(),
+        "x": typed_array(df_tools["x_pos"]),
+        "xaxis": "x",
+        "y": typed_array(df_tools["y_pos"]),
+        "yaxis": "y",
+        "type": "scatter",
+        "textfont": {"color": colors.tolist(), "size": typed_array(font_sizes)},
+        "textposition": "middle center",
+        "cliponaxis": False # words centered near the edge of the plot area extend into the margins
+    }
+    layout = {
+        "template": figure_template,
+        "xaxis": hidden_axis("x_pos"),
+        "yaxis": hidden_axis("y_pos"),
+        "legend": {"tracegroupgap": 0},
+        "margin": {"t": 10, "l": 10, "r": 10, "b": 10},
+        "height": 300,
+        "width": 650,
+        "plot_bgcolor": "white",
+        "autosize": False
+    }
+    return {"data": [trace], "layout": layout}
+
+
+def gantt_trace(rows, color):
+    data = dataset()
+    gantt_columns = data.gantt_columns
+    return {
+        "base": gantt_columns["base"][rows].tolist(),
+        "hovertemplate": "%{customdata[0]} – %{customdata[1]} (%{customdata[2]})<br>Employer: %{customdata[3]}<br>Client: %{customdata[4]}",
+        "legendgroup": "",
+        "marker": {"color": color, "pattern": {"shape": ""}},
+        "name": "",
+        "orientation": "h",
+        "showlegend": False,
+        "text": gantt_columns["text"][rows].tolist(),
+        "textposition": "outside",
+        "x": gantt_columns["x"][rows].tolist(),
+        "xaxis": "x",
+        "y": gantt_columns["y"][rows].tolist(),
+        "yaxis": "y",
+        "type": "bar",
+        "textfont": {"color": "rgb(85,85,85)", "size": 11},
+        "customdata": data.gantt_customdata # all the bars' customdata on every trace, as px.timeline does
+    }
+
+
+def gantt_figure(colors, shapes, single_trace=False):
+    if single_trace: # a fixed trace structure that the patch-based updates can address
+        traces = [gantt_trace(slice(None), colors.tolist())]
+    else: # one trace per color, in the order of first appearance (as px.timeline does)
+        traces = [gantt_trace(colors == color, color) for color in dict.fromkeys(colors.tolist())]
+    layout = {
+        "template": figure_template,
+        "xaxis": {
+            "anchor": "y",
+            "domain": [0.0, 1.0],
+            "type": "date",
+            "tickfont": {"size": 10},
+            "tickvals": [f"{y}-01-01T00:00:00" for y in range(2010, 2026, 5)],
+            "ticktext": [str(y) for y in range(2010, 2026, 5)],
+            "tickangle": 90,
+            "color": "gray",
+            "range": ["2009-10-01T00:00:00", "2025-12-31T00:00:00"]
+        },
+        "yaxis": {
+            "anchor": "x",
+            "domain": [0.0, 1.0],
+            "title": {"text": "Client_Name_Full"},
+            "categoryorder": "array",
+            "categoryarray": dataset().gantt_clients_list[::-1], # px.timeline lists the categories bottom-up
+            "visible": False
+        },
+        "legend": {"tracegroupgap": 0},
+        "margin": {"t": 0, "l": 0, "r": 0, "b": 0},
+        "barmode": "overlay",
+        "hoverlabel": {
+            "font": {"size": 12, "color": "rgb(51,51,51)", "family": "Arial"},
+            "bgcolor": "whitesmoke",
+            "bordercolor": "lightgray"
+        },
+        "showlegend": False,
+        "title": {},
+        "plot_bgcolor": "white",
+        "shapes": shapes
+    }
+    return {"data": traces, "layout": layout}
+
+
+def wordcloud_figure_express(colors, font_sizes):
+    import plotly.express as px
+
+    df_plot = dataset().df_tools.assign(Color=colors, Font_Size=font_sizes)
 
     fig = px.scatter(
         df_plot,
@@ -171,11 +880,12 @@ def create_wordcloud(selected_client_order=None, selected_role=None, selected_to
         textposition="middle center",
         textfont_size=df_plot["Font_Size"],
         textfont_color=df_plot["Color"],
-        hovertemplate="%{text}"
+        hovertemplate="%{text}",
+        cliponaxis=False
     )
     fig.update_layout(
-        xaxis=dict(showgrid=False, showticklabels=False, zeroline=False, fixedrange=True),
-        yaxis=dict(showgrid=False, showticklabels=False, zeroline=False, fixedrange=True),
+        xaxis=dict(showgrid=False, showticklabels=False, zeroline=False, fixedrange=True, range=[0, 1]),
+        yaxis=dict(showgrid=False, showticklabels=False, zeroline=False, fixedrange=True, range=[0, 1]),
         plot_bgcolor='white',
         autosize=False,
         margin=dict(l=10, r=10, t=10, b=10)
@@ -186,97 +896,23 @@ def create_wordcloud(selected_client_order=None, selected_role=None, selected_to
     return fig
 
 
-def create_gantt(selected_client_order=None, selected_role=None, selected_tool=None, selected_task=None, selected_achievement=None):
-    df_plot = df_gantt.copy()
-
-    # apply darker gray color to the highlighted Gantt bars (if any)
-    if selected_client_order is not None: # if triggered by the User clicking on the Clients table
-        df_plot.loc[df_plot['Client_Order'] == selected_client_order, 'color'] = 'dimgray'
-    elif selected_role is not None: # if triggered by the User clicking on the Roles table
-        related_client_orders = df[df["Role"] == selected_role]["Client_Order"].unique()
-        df_plot.loc[df_plot['Client_Order'].isin(related_client_orders), 'color'] = 'dimgray'
-    elif selected_tool is not None:
-        related_client_orders = df[df["Tool"] == selected_tool]["Client_Order"].unique()
-        df_plot.loc[df_plot['Client_Order'].isin(related_client_orders), 'color'] = 'dimgray'
-    elif selected_task is not None:
-        related_client_orders = df[df["Task"] == selected_task]["Client_Order"].unique()
-        df_plot.loc[df_plot['Client_Order'].isin(related_client_orders), 'color'] = 'dimgray'
-    elif selected_achievement is not None:
-        related_client_orders = df[df["Achievement"] == selected_achievement]["Client_Order"].unique()
-        df_plot.loc[df_plot['Client_Order'].isin(related_client_orders), 'color'] = 'dimgray'
+def gantt_figure_express(colors, shapes, single_trace=False):
+    import plotly.express as px
 
-    clients_list = list(dict.fromkeys(df_plot["Client_Name_Full"].tolist()[::-1]))
-
-    selected_client_row = clients_orders_list.index(selected_client_order) if selected_client_order is not None else None
+    df_plot = dataset().df_gantt.assign(color=colors)
 
     fig = px.timeline(
         df_plot,
         x_start="Start_Date",
         x_end="End_Date",
         y="Client_Name_Full",
-        color="color",
+        color=None if single_trace else "color", # px.timeline splits bars into one trace per color
         text="Employer_Label",
-        color_discrete_map="identity",
-        category_orders={"Client_Name_Full": clients_list}
+        color_discrete_map=None if single_trace else "identity",
+        category_orders={"Client_Name_Full": dataset().gantt_clients_list}
     )
-
-    shapes = [] # blue highlight on selection if any (from callbacks) + row banding (default)
-    for i in range(len(clients_list)):
-        if selected_client_order is not None and i == len(clients_list) - selected_client_row - 1:  # if triggered by the User clicking on the Clients table
-            shapes.append({
-                "type": "rect",
-                "xref": "paper",
-                "yref": "y",
-                "x0": 0,
-                "x1": 1,
-                "y0": i - 0.5,
-                "y1": i + 0.5,
-                "fillcolor": "rgba(173, 216, 230, 1)",
-                "layer": "below",
-                "line": {"width": 0}
-            })
-        elif i % 2 == 0: # above is blue highlighting if any (from callbacks), which overrides the default row banding (below)
-            shapes.append({
-                "type": "rect",
-                "xref": "paper",
-                "yref": "y",
-                "x0": 0,
-                "x1": 1,
-                "y0": i - 0.5,
-                "y1": i + 0.5,
-                "fillcolor": "rgba(240, 240, 240, 0.5)",
-                "layer": "below",
-                "line": {"width": 0}
-            })
-
-        if selected_role is not None or selected_tool is not None or selected_task is not None or selected_achievement is not None:
-            # if triggered by the User clicking on the Roles/Tools/Tasks/Achievements table
-            if all_clients_orders[i] in related_client_orders:
-                shapes.append({
-                    "type": "rect",
-                    "xref": "paper",
-                    "yref": "y",
-                    "x0": 0,
-                    "x1": 1,
-                    "y0": i - 0.5,
-                    "y1": i + 0.5,
-                    "fillcolor": "rgba(173, 216, 230, 1)",
-                    "layer": "below",
-                    "line": {"width": 0}
-                })
-            elif i % 2 == 0: # above is blue highlighting if any (from callbacks), which overrides the default row banding (below)
-                shapes.append({
-                    "type": "rect",
-                    "xref": "paper",
-                    "yref": "y",
-                    "x0": 0,
-                    "x1": 1,
-                    "y0": i - 0.5,
-                    "y1": i + 0.5,
-                    "fillcolor": "rgba(240, 240, 240, 0.5)",
-                    "layer": "below",
-                    "line": {"width": 0}
-                })
+    if single_trace: # a fixed trace structure that the patch-based updates can address
+        fig.update_traces(marker_color=df_plot["color"])
 
     fig.update_layout(
         showlegend=False,
@@ -311,200 +947,831 @@ def create_gantt(selected_client_order=None, selected_role=None, selected_tool=N
     return fig
 
 
+@cached_figure
+def create_wordcloud(selected_client_order=None, selected_role=None, selected_tool=None, selected_task=None, selected_achievement=None, selected_items=None):
+    colors, font_sizes = wordcloud_highlighting(*selection_of(selected_client_order, selected_role, selected_tool, selected_task, selected_achievement, selected_items))
+    return wordcloud_figure_express(colors, font_sizes) if PLOTLY_EXPRESS else wordcloud_figure(colors, font_sizes)
+
+
+@cached_figure
+def create_gantt(selected_client_order=None, selected_role=None, selected_tool=None, selected_task=None, selected_achievement=None, selected_items=None, single_trace=False):
+    colors, shapes = gantt_highlighting(*selection_of(selected_client_order, selected_role, selected_tool, selected_task, selected_achievement, selected_items))
+    return gantt_figure_express(colors, shapes, single_trace) if PLOTLY_EXPRESS else gantt_figure(colors, shapes, single_trace)
+
+
+PATCH_MODE = os.environ.get("CV_PATCH") == "1" # callbacks send only the changed figure arrays instead of full figures
+
+
+def gantt_patch(**selection):
+    colors, shapes = gantt_highlighting(*selection_of(**selection))
+    patch = Patch()
+    patch["data"][0]["marker"]["color"] = colors.tolist()
+    patch["layout"]["shapes"] = shapes
+    return patch
+
+
+def wordcloud_patch(**selection):
+    colors, font_sizes = wordcloud_highlighting(*selection_of(**selection))
+    patch = Patch()
+    patch["data"][0]["textfont"]["color"] = colors.tolist()
+    patch["data"][0]["textfont"]["size"] = font_sizes.tolist()
+    return patch
+
+
+def deferred(build, **selection):
+    # in the async mode (see ASYNC), a figure requested by a handler is built in the figure pool while the handler computes the
+    # other outputs: the handler's output is then a Future, which the async dispatcher awaits
+    if has_request_context() and g.get("defer_figures"):
+        return submit_figure(build, **selection)
+    return build(**selection)
+
+
+def gantt_output(**selection):
+    return deferred(gantt_patch if PATCH_MODE else create_gantt, **selection)
+
+
+def wordcloud_output(**selection):
+    return deferred(wordcloud_patch if PATCH_MODE else create_wordcloud, **selection)
+
+
+def crossfilter_store_data():
+    """Everything the client-side callbacks (assets/crossfilter.js) need, shipped to the browser once."""
+    data = dataset()
+    df_gantt = data.df_gantt
+    df_tools = data.df_tools
+
+    relations = {dimension: {} for dimension in dimensions}
+    for (dimension, value), related_values in data.relation_index.items():
+        relations[dimension][str(value)] = related_values
+
+    gantt_bars = df_gantt.assign(
+        base=df_gantt["Start_Date"].dt.strftime("%Y-%m-%d"),
+        x=(df_gantt["End_Date"] - df_gantt["Start_Date"]) // pd.Timedelta(milliseconds=1), # bar length in ms, as in px.timeline
+    )
+
+    return {
+        "relations": relations,
+        "clients_style": data.clients_style,
+        "roles_style": data.roles_style,
+        "tool_type_colors": tool_type_colors,
+        "tool_type_colors_2": tool_type_colors_2,
+        "achievements": data.df_achievements.to_dict("records"),
+        "tasks": data.df_tasks.to_dict("records"),
+        "gantt": {
+            "figure": create_gantt(),
+            "bars": {
+                "client_order": gantt_bars["Client_Order"].tolist(),
+                "color": gantt_bars["color"].tolist(),
+                "base": gantt_bars["base"].tolist(),
+                "x": gantt_bars["x"].tolist(),
+                "y": gantt_bars["Client_Name_Full"].tolist(),
+                "text": gantt_bars["Employer_Label"].astype(object).where(gantt_bars["Employer_Label"].notna(), None).tolist(),
+            },
+            "clients_orders_list": data.clients_orders_list,
+            "all_clients_orders": data.all_clients_orders,
+            "clients_list_length": df_gantt["Client_Name_Full"].nunique(),
+            "merged_bands": MERGED_BANDS,
+        },
+        "word_cloud": {
+            "figure": create_wordcloud(),
+            "tools": df_tools["Tool"].tolist(),
+            "tool_types": df_tools["Tool_Type"].tolist(),
+            "font_sizes": df_tools["Font_Size"].tolist(),
+        },
+    }
+
+
 #########################################################################################################################################################
 ###################################################################### APP LAYOUT #######################################################################
 #########################################################################################################################################################
 
 
-app = Dash(__name__)
+ASYNC_MODE = os.environ.get("CV_ASYNC") == "1" # async crossfilter callback, figures built in a thread pool (needs `pip install dash[async]`)
+app = Dash(__name__, **({"use_async": True} if ASYNC_MODE else {}))
+
+
+CLIENTSIDE_MODE = os.environ.get("CV_CLIENTSIDE") == "1" # crossfilter callbacks run in the browser (assets/crossfilter.js)
+
+
+# Paging mode: the Achievements / Tasks tables hold one page of rows at a time; a click sends the table's filtered index (row
+# positions in the unfiltered table) to the "<table>-rows" store, and table_page() sends the rows of the current page, sorted
+TABLE_PAGE_SIZE = 0 if CLIENTSIDE_MODE else int(os.environ.get("CV_TABLE_PAGE_SIZE", 0)) # 0 = all rows at once
+paged_tables = {"achievements-table": "Achievement", "tasks-table": "Task"} if TABLE_PAGE_SIZE > 0 else {}
+
+
+def table_page(dimension, rows, page_current, page_size, sort_by):
+    # (records of the page, page count); rows: the filtered index, None for all rows
+    data = dataset()
+    df_table = {"Achievement": data.df_achievements, "Task": data.df_tasks}[dimension]
+    positions = np.arange(len(df_table)) if rows is None else np.asarray(rows, dtype=np.int64)
+    if sort_by:
+        keys = data.sort_keys[dimension][sort_by[0]["column_id"]][positions]
+        # equal values stay in table order in both directions
+        positions = positions[np.lexsort((positions, -keys if sort_by[0]["direction"] == "desc" else keys))]
+    start = page_current * page_size
+    return df_table.iloc[positions[start:start + page_size]].to_dict("records"), max(1, -(-len(positions) // page_size))
+
+
+def table_props(dimension):
+    # data of the Achievements / Tasks table, plus the first page and the paging / sorting settings in the paging mode
+    if not paged_tables:
+        return {"data": {"Achievement": dataset().df_achievements, "Task": dataset().df_tasks}[dimension].to_dict("records")}
+    records, page_count = table_page(dimension, None, 0, TABLE_PAGE_SIZE, [])
+    return {
+        "data": records,
+        "page_action": "custom",
+        "page_current": 0,
+        "page_size": TABLE_PAGE_SIZE,
+        "page_count": page_count,
+        "sort_action": "custom",
+        "sort_mode": "single",
+        "sort_by": [],
+        "virtualization": True,
+    }
+
+
+# The Projects tooltips are sent once per row, as row_index conditions without a column_id (so they apply to every cell of the
+# row), instead of a copy of each row's tooltip per column in tooltip_data (the projects table is neither sorted nor filtered,
+# so row_index is the df_clients position). CV_TOOLTIP_DATA=1 sends the per-cell tooltip_data instead.
+TOOLTIP_DATA = os.environ.get("CV_TOOLTIP_DATA") == "1"
+
+
+def projects_tooltips(data):
+    if TOOLTIP_DATA:
+        return {"tooltip_data": [{column: {"value": text, "type": "markdown"} for column in data.df_clients.columns} for text in data.client_tooltips]}
+    return {"tooltip_conditional": [{"if": {"row_index": row}, "type": "markdown", "value": text} for row, text in enumerate(data.client_tooltips)]}
+
+
+# Table highlighting: the style_data_conditional of a table = its base styles (data.clients_style / data.roles_style) + the
+# highlight of the clicked row or of the rows of the related values. By default, one filter_query rule per value, which the
+# browser evaluates against every row. In the compact mode (CV_COMPACT_HIGHLIGHT=1) a single highlight rule follows the base
+# styles in the layout, and a click sends a Patch of that rule only: a row_index list on the Projects / Roles tables (which always
+# show all of their rows), one filter_query joined with "or" on the (filtered) Achievements / Tasks tables.
+def table_highlight(table, column, values=(), row=None):
+    data = dataset()
+    base_style = data.roles_style if table == "roles-table" else data.clients_style
+    if not COMPACT_HIGHLIGHT:
+        rules = [{"if": {"row_index": row}}] if row is not None else [{"if": {"filter_query": f'{{{column}}} = "{value}"'}} for value in values]
+        return base_style + [{**rule, "backgroundColor": "lightblue"} for rule in rules]
+    patch = Patch()
+    patch[len(base_style)] = highlight_rule(table, column, values, row)
+    return patch
+
+
+def highlight_rule(table, column, values=(), row=None):
+    if row is not None:
+        return {"if": {"row_index": row}, "backgroundColor": "lightblue"}
+    if table in ("projects-table", "roles-table") or not values:
+        positions = dataset().row_positions[column]
+        return {"if": {"row_index": sorted(positions[value] for value in values if value in positions)}, "backgroundColor": "lightblue"}
+    return {"if": {"filter_query": " or ".join(f'{{{column}}} = "{value}"' for value in values)}, "backgroundColor": "lightblue"}
+
+
+def table_style(table, column):
+    # the style_data_conditional of a table in the layout (nothing highlighted)
+    if not COMPACT_HIGHLIGHT:
+        return table_highlight(table, column)
+    data = dataset()
+    return (data.roles_style if table == "roles-table" else data.clients_style) + [highlight_rule(table, column)]
+
+
+# Static files of the layout (header icons, PDF CV) are served by this app under content-hashed URLs, which browsers and CDNs
+# cache for a year without revalidating ("immutable": a changed file gets a new URL). The header icons are merged into one SVG
+# sprite (the PNGs side by side, one <view> per icon, shown with "sprite.svg#icon"), so all of them take a single request; the
+# PNGs in assets/ are kept at full size and resampled for the sprite to 64 px (2.5x their display size, for high-DPI screens),
+# cached on disk. The files are served with range requests, e.g. for resumable PDF downloads and PDF viewers that fetch the
+# pages on demand, except the compressible generated ones (the sprite), which are compressed by compress_and_validate instead.
+static_files = {} # file name in the URL -> (path or None, body or None, mimetype)
+header_icon_width = 64 # px of the header icons in the sprite
+
+
+def static_url(name, path=None, body=None):
+    if body is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    else:
+        digest = hashlib.sha256(body).hexdigest()[:12]
+    stem, extension = os.path.splitext(name)
+    url_name = f"{stem}.{digest}{extension}"
+    static_files[url_name] = (path, body, mimetypes.guess_type(name)[0] or "application/octet-stream")
+    return f"/static-assets/{urllib.parse.quote(url_name)}"
+
+
+def resampled_png(png, width):
+    # the PNG scaled down to the given width (same aspect ratio), unchanged if it is not wider
+    from PIL import Image # imported here: only needed when the resampled icon is not cached yet
+
+    image = Image.open(io.BytesIO(png))
+    if image.width <= width:
+        return png
+    resized = image.convert("RGBA").resize((width, round(image.height * width / image.width)), Image.LANCZOS) # alpha-weighted
+    output = io.BytesIO()
+    resized.save(output, format="PNG", optimize=True)
+    return output.getvalue()
+
+
+def header_icon_png(name):
+    # assets/<name>.png resampled to header_icon_width (cached on disk, keyed by the source file and the width)
+    with open(os.path.join("assets", f"{name}.png"), "rb") as f:
+        source = f.read()
+    key = hashlib.sha256(source).hexdigest()
+    path = os.path.join(os.environ.get("CV_SNAPSHOT_DIR", "cache"), f"icon-{name}-{header_icon_width}px-{key[:16]}.png")
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        png = resampled_png(source, header_icon_width)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(f"{path}.{os.getpid()}.tmp", "wb") as f:
+            f.write(png)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+        return png
+
+
+def icons_sprite(names):
+    # SVG sprite of assets/<name>.png (resampled): -> (sprite, {name: (width, height)})
+    views = []
+    images = []
+    sizes = {}
+    x = 0
+    for name in names:
+        png = header_icon_png(name)
+        width, height = struct.unpack(">II", png[16:24]) # IHDR chunk
+        sizes[name] = (width, height)
+        views.append(f'<view id="{name}" viewBox="{x} 0 {width} {height}"/>')
+        images.append(f'<image x="{x}" y="0" width="{width}" height="{height}" href="data:image/png;base64,{base64.b64encode(png).decode("ascii")}"/>')
+        x += width
+    height = max(height for _, height in sizes.values())
+    sprite = f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {x} {height}">{"".join(views)}{"".join(images)}</svg>'
+    return sprite.encode("utf-8"), sizes
+
+
+header_icons_sprite, header_icon_sizes = icons_sprite(["email", "linkedin", "github", "link", "pdf"])
+header_icons_url = static_url("icons.svg", body=header_icons_sprite)
+cv_pdf_url = static_url("Yury Ulasenka - CV.pdf", path=os.path.join("assets", "Yury Ulasenka - CV.pdf"))
+
+
+def header_icon(name, title):
+    width, height = header_icon_sizes[name]
+    return html.Img(src=f"{header_icons_url}#{name}", style={"width": "25px", "height": f"{25 * height / width:g}px"}, title=title)
+
+
+@app.server.route("/static-assets/<name>")
+def serve_static_file(name):
+    if name not in static_files:
+        abort(404)
+    path, body, mimetype = static_files[name]
+    if body is not None and mimetype in compressible_mimetypes:
+        response = Response(body, mimetype=mimetype)
+        response.cache_control.max_age = 365 * 24 * 3600
+    else:
+        response = send_file(path if body is None else io.BytesIO(body), mimetype=mimetype, conditional=True, etag=name, max_age=365 * 24 * 3600)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 
 app.title = 'Yury Ulasenka | CV'
 
 
-app.layout = html.Div([
-    html.Div(
-        style={"width": "1360px", "height": "75px", "backgroundColor": "lightgray","position": "absolute", "left": "0px", "top": "0px", "zIndex": 1}
-    ),
-    html.Div(
-        "Yury Ulasenka | Interactive Resume/CV",
-        style={"position": "absolute", "left": "27px", "top": "10px", "backgroundColor": None, "height": "30px",
-               "padding": "5px", "fontSize": "20px", "fontWeight": "bold", "color": "rgb(0,0,0)", "zIndex": 2}
-    ),
-    html.Div(
-        [
-        "Click on views to filter / highlight other views. Click outside views to reset. Hover over views for tooltips.",
-        ],
-        style={"position": "absolute", "left": "27px", "top": "40px", "backgroundColor": None, "height": "25px",
-               "padding": "5px", "fontSize": "12px", "fontWeight": "bold", "color": "rgb(51,51,51)", "fontStyle": "italic", "zIndex": 2}
-    ),
-    html.Div(
-        children=[
-            html.Div(
-                dcc.Graph(id="gantt-chart", figure=create_gantt(), config={"displayModeBar": False, "displaylogo": False}),
-                style={"position": "absolute", "left": "0px", "top": "25px", "width": "300px", "height": "376px", "borderTop": "1px solid lightgray", "zIndex": 12}
-            ),
-            html.Div(
-                "Timeline / Employer",
-                style={"position": "absolute", "left": "0px", "top":  "0px","backgroundColor": "white", "height": "25px",
-                       "padding": "5px", "fontSize": "11px", "fontWeight": "bold", "color": "rgb(85,85,85)", "zIndex": 11}
-            ),
-            html.Div(
-                dash_table.DataTable(
-                    id="projects-table",
-                    data=df_clients.to_dict("records"),
-                    columns=[
-                        {"name": "Country", "id": "Country"},
-                        {"name": "Client", "id": "Client_Name_Full"},
-                        {"name": "Project / Product", "id": "Project"},
-                        {"name": "Client_Order", "id": "Client_Order", "hideable": True}
-                    ],
-                    tooltip_data=tooltip_data,
-                    hidden_columns=["Client_Order", 'Dates_range', 'NDA', 'Big_five'],
-                    style_cell={"textAlign": "left", "border": "none", "fontWeight": "bold", "color": "rgb(51,51,51)"},
-                    style_header={"borderBottom": "1px solid lightgray", "fontWeight": "bold", "color": "rgb(85,85,85)", "backgroundColor": "white", "fontSize": "11px"},
-                    style_data_conditional=clients_style,
-                    css=[{"selector": ".show-hide", "rule": "display: none"}, {"selector": ".dash-spreadsheet tr", "rule": "height: 25px;"}],
-                ),
-                style={"position": "absolute", "left": "285px", "top": "0px", "width": "750px", "height": "375px", "zIndex": 13}
-            ),
-            html.Div(
-                dash_table.DataTable(
-                    id="roles-table",
-                    data=df_roles.to_dict("records"),
-                    columns=[{"name": "Role", "id": "Role"}],
-                    style_cell={"textAlign": "left", "border": "none", "color": "rgb(85,85,85)"},
-                    style_header={"borderBottom": "1px solid lightgray", "fontWeight": "bold", "color": "rgb(85,85,85)", "backgroundColor": "white", "fontSize": "11px"},
-                    style_data_conditional=roles_style,
-                    css=[{"selector": ".dash-spreadsheet tr", "rule": "height: 29px;"}],
+def build_layout():
+    data = dataset()
+    return html.Div([
+        html.Div(
+            style={"width": "1360px", "height": "75px", "backgroundColor": "lightgray","position": "absolute", "left": "0px", "top": "0px", "zIndex": 1}
+        ),
+        html.Div(
+            "Yury Ulasenka | Interactive Resume/CV",
+            style={"position": "absolute", "left": "27px", "top": "10px", "backgroundColor": None, "height": "30px",
+                   "padding": "5px", "fontSize": "20px", "fontWeight": "bold", "color": "rgb(0,0,0)", "zIndex": 2}
+        ),
+        html.Div(
+            [
+            "Click on views to filter / highlight other views. Click outside views to reset. Hover over views for tooltips."
+            + ("" if CLIENTSIDE_MODE else " Ctrl / Shift-click to combine selections."),
+            ],
+            style={"position": "absolute", "left": "27px", "top": "40px", "backgroundColor": None, "height": "25px",
+                   "padding": "5px", "fontSize": "12px", "fontWeight": "bold", "color": "rgb(51,51,51)", "fontStyle": "italic", "zIndex": 2}
+        ),
+        html.Div(
+            children=[
+                html.Div(
+                    dcc.Graph(id="gantt-chart", figure=create_gantt(single_trace=True) if PATCH_MODE else create_gantt(), config={"displayModeBar": False, "displaylogo": False}),
+                    style={"position": "absolute", "left": "0px", "top": "25px", "width": "300px", "height": "376px", "borderTop": "1px solid lightgray", "zIndex": 12}
                 ),
-                style={"position": "absolute", "left": "1080px", "top": "0px", "width": "250px", "height": "325px", "zIndex": 12}
-            ),
-        ],
-        style={"position": "relative", "left": "20px", "top": "80px", "width": "1330px","zIndex": 11},
-    ),
-
-    html.Div(
-        children=[
-            html.Div(
-                dash_table.DataTable(
-                    id="achievements-table",
-                    data=df_achievements.to_dict("records"),
-                    columns=[{"name": "Achievement", "id": "Achievement"}],
-                    style_cell={"textAlign": "left", "border": "none", "color": "rgb(51,51,51)", "fontWeight": "bold"},
-                    style_header={"borderBottom": "1px solid lightgray", "fontWeight": "bold", "color": "rgb(85,85,85)", "backgroundColor": "white", "fontSize": "11px"},
-                    style_table={"overflowY": "auto", "height": "150px"},
-                    style_data_conditional=clients_style,
-                    fixed_rows={'headers': True},
-                    css=[{"selector": ".dash-spreadsheet tr", "rule": "height: 25px;"}]
+                html.Div(
+                    "Timeline / Employer",
+                    style={"position": "absolute", "left": "0px", "top":  "0px","backgroundColor": "white", "height": "25px",
+                           "padding": "5px", "fontSize": "11px", "fontWeight": "bold", "color": "rgb(85,85,85)", "zIndex": 11}
                 ),
-                style={"position": "absolute", "left": "0px", "top": "0px", "width": "650px", "height": "150px", "zIndex": 2}
-            ),
-            html.Div(
-                dash_table.DataTable(
-                    id="tasks-table",
-                    data=df_tasks.to_dict("records"),
-                    columns=[{"name": "Task", "id": "Task"}],
-                    style_cell={"textAlign": "left", "border": "none", "color": "rgb(85,85,85)"},
-                    style_header={"borderBottom": "1px solid lightgray", "fontWeight": "bold", "color": "rgb(85,85,85)", "backgroundColor": "white", "fontSize": "11px"},
-                    style_table={"overflowY": "auto", "height": "150px"},
-                    style_data_conditional=clients_style,
-                    fixed_rows={'headers': True},
-                    css=[{"selector": ".dash-spreadsheet tr", "rule": "height: 25px;"}]
-                ),
-                style={"position": "absolute", "left": "0px", "top": "175px", "width": "650px", "height": "150px", "zIndex": 2}
-            ),
-            html.Div(
-                "Tool",
-                style={"position": "absolute", "left": "680px", "top": "0px", "backgroundColor": "white", "height": "25px",
-                       "padding": "5px", "fontSize": "11px", "fontWeight": "bold", "color": "rgb(85,85,85)", "zIndex": 2}
-            ),
-            html.Div(
-                dcc.Graph(
-                    id="word-cloud",
-                    figure=create_wordcloud(),
-                    config={"displayModeBar": False, "displaylogo": False},
+                html.Div(
+                    dash_table.DataTable(
+                        id="projects-table",
+                        data=data.df_clients.to_dict("records"),
+                        columns=[
+                            {"name": "Country", "id": "Country"},
+                            {"name": "Client", "id": "Client_Name_Full"},
+                            {"name": "Project / Product", "id": "Project"},
+                            {"name": "Client_Order", "id": "Client_Order", "hideable": True}
+                        ],
+                        **projects_tooltips(data),
+                        hidden_columns=["Client_Order", 'Dates_range', 'NDA', 'Big_five'],
+                        style_cell={"textAlign": "left", "border": "none", "fontWeight": "bold", "color": "rgb(51,51,51)"},
+                        style_header={"borderBottom": "1px solid lightgray", "fontWeight": "bold", "color": "rgb(85,85,85)", "backgroundColor": "white", "fontSize": "11px"},
+                        style_data_conditional=table_style("projects-table", "Client_Order"),
+                        css=[{"selector": ".show-hide", "rule": "display: none"}, {"selector": ".dash-spreadsheet tr", "rule": "height: 25px;"}],
+                    ),
+                    style={"position": "absolute", "left": "285px", "top": "0px", "width": "750px", "height": "375px", "zIndex": 13}
                 ),
-                style={"position": "absolute", "left": "680px", "top": "25px", "borderTop": "1px solid lightgray", "zIndex": 2}
-            )
-        ],
-        style={"position": "relative", "left": "20px", "top": "500px", "width": "1330px","zIndex": 1},
-    ),
-    html.Div(
-        id="background",
-        style={"position": "absolute", "left": "0px", "top": "0px", "width": "95vw", "height": "95vh", "backgroundColor": "white", "zIndex": 0}
-    ),
-
-
-    html.Div(
-        children=[
-            html.Div(
-                html.A(
-                    html.Img(
-                        src="https://raw.githubusercontent.com/half-man-half-potato/cv/master/assets/email.png",
-                        style={"width": "25px", "height": "auto"},
-                        title="40to@protonmail.com"
+                html.Div(
+                    dash_table.DataTable(
+                        id="roles-table",
+                        data=data.df_roles.to_dict("records"),
+                        columns=[{"name": "Role", "id": "Role"}],
+                        style_cell={"textAlign": "left", "border": "none", "color": "rgb(85,85,85)"},
+                        style_header={"borderBottom": "1px solid lightgray", "fontWeight": "bold", "color": "rgb(85,85,85)", "backgroundColor": "white", "fontSize": "11px"},
+                        style_data_conditional=table_style("roles-table", "Role"),
+                        css=[{"selector": ".dash-spreadsheet tr", "rule": "height: 29px;"}],
                     ),
-                    style={"textAlign": "center", "position": "absolute", "left": "10px", "top": "0px", "zIndex": 1},
-                    href="mailto:40to@protonmail.com",
-                    target="_blank"
-                )
-            ),
-            html.Div(
-                html.A(
-                    html.Img(
-                        src="https://raw.githubusercontent.com/half-man-half-potato/cv/master/assets/linkedin.png",
-                        style={"width": "25px", "height": "auto"},
-                        title="https://www.linkedin.com/in/yury-ulasenka/"
+                    style={"position": "absolute", "left": "1080px", "top": "0px", "width": "250px", "height": "325px", "zIndex": 12}
+                ),
+            ],
+            style={"position": "relative", "left": "20px", "top": "80px", "width": "1330px","zIndex": 11},
+        ),
+
+        html.Div(
+            children=[
+                html.Div(
+                    dash_table.DataTable(
+                        id="achievements-table",
+                        **table_props("Achievement"),
+                        columns=[{"name": "Achievement", "id": "Achievement"}],
+                        style_cell={"textAlign": "left", "border": "none", "color": "rgb(51,51,51)", "fontWeight": "bold"},
+                        style_header={"borderBottom": "1px solid lightgray", "fontWeight": "bold", "color": "rgb(85,85,85)", "backgroundColor": "white", "fontSize": "11px"},
+                        style_table={"overflowY": "auto", "height": "150px"},
+                        style_data_conditional=table_style("achievements-table", "Achievement"),
+                        fixed_rows={'headers': True},
+                        css=[{"selector": ".dash-spreadsheet tr", "rule": "height: 25px;"}]
                     ),
-                    style={"textAlign": "center", "position": "absolute", "left": "45px", "top": "0px", "zIndex": 1},
-                    href="https://www.linkedin.com/in/yury-ulasenka/",
-                    target="_blank"
-                )
-            ),
-            html.Div(
-                html.A(
-                    html.Img(
-                        src="https://raw.githubusercontent.com/half-man-half-potato/cv/master/assets/github.png",
-                        style={"width": "25px", "height": "auto"},
-                        title="https://github.com/half-man-half-potato/cv"
+                    style={"position": "absolute", "left": "0px", "top": "0px", "width": "650px", "height": "150px", "zIndex": 2}
+                ),
+                html.Div(
+                    dash_table.DataTable(
+                        id="tasks-table",
+                        **table_props("Task"),
+                        columns=[{"name": "Task", "id": "Task"}],
+                        style_cell={"textAlign": "left", "border": "none", "color": "rgb(85,85,85)"},
+                        style_header={"borderBottom": "1px solid lightgray", "fontWeight": "bold", "color": "rgb(85,85,85)", "backgroundColor": "white", "fontSize": "11px"},
+                        style_table={"overflowY": "auto", "height": "150px"},
+                        style_data_conditional=table_style("tasks-table", "Task"),
+                        fixed_rows={'headers': True},
+                        css=[{"selector": ".dash-spreadsheet tr", "rule": "height: 25px;"}]
                     ),
-                    style={"textAlign": "center", "position": "absolute", "left": "80px", "top": "0px", "zIndex": 1},
-                    href="https://github.com/half-man-half-potato/cv",
-                    target="_blank"
-                )
-            ),
-            html.Div(
-                html.A(
-                    html.Img(
-                        src="https://raw.githubusercontent.com/half-man-half-potato/cv/master/assets/link.png",
-                        style={"width": "25px", "height": "auto"},
-                        title="more links here: https://yuryulasenka.wixsite.com/resume"
+                    style={"position": "absolute", "left": "0px", "top": "175px", "width": "650px", "height": "150px", "zIndex": 2}
+                ),
+                html.Div(
+                    "Tool",
+                    style={"position": "absolute", "left": "680px", "top": "0px", "backgroundColor": "white", "height": "25px",
+                           "padding": "5px", "fontSize": "11px", "fontWeight": "bold", "color": "rgb(85,85,85)", "zIndex": 2}
+                ),
+                html.Div(
+                    dcc.Graph(
+                        id="word-cloud",
+                        figure=create_wordcloud(),
+                        config={"displayModeBar": False, "displaylogo": False},
                     ),
-                    style={"textAlign": "center", "position": "absolute", "left": "115px", "top": "0px", "zIndex": 1},
-                    href="https://yuryulasenka.wixsite.com/resume",
-                    target="_blank"
+                    style={"position": "absolute", "left": "680px", "top": "25px", "borderTop": "1px solid lightgray", "zIndex": 2}
                 )
-            ),
-            html.Div(
-                html.A(
-                    html.Img(
-                        src="https://raw.githubusercontent.com/half-man-half-potato/cv/master/assets/pdf.png",
-                        style={"width": "25px", "height": "auto"},
-                        title="download a PDF resume/CV"
-                    ),
-                    style={"textAlign": "center", "position": "absolute", "left": "150px", "top": "0px", "zIndex": 1},
-                    href="/assets/Yury Ulasenka - CV.pdf",
-                    download="Yury Ulasenka - CV.pdf",
-                    target="_blank"
+            ],
+            style={"position": "relative", "left": "20px", "top": "500px", "width": "1330px","zIndex": 1},
+        ),
+        html.Div(
+            id="background",
+            style={"position": "absolute", "left": "0px", "top": "0px", "width": "95vw", "height": "95vh", "backgroundColor": "white", "zIndex": 0}
+        ),
+
+
+        html.Div(
+            children=[
+                html.Div(
+                    html.A(
+                        header_icon("email", title="40to@protonmail.com"),
+                        style={"textAlign": "center", "position": "absolute", "left": "10px", "top": "0px", "zIndex": 1},
+                        href="mailto:40to@protonmail.com",
+                        target="_blank"
+                    )
+                ),
+                html.Div(
+                    html.A(
+                        header_icon("linkedin", title="https://www.linkedin.com/in/yury-ulasenka/"),
+                        style={"textAlign": "center", "position": "absolute", "left": "45px", "top": "0px", "zIndex": 1},
+                        href="https://www.linkedin.com/in/yury-ulasenka/",
+                        target="_blank"
+                    )
+                ),
+                html.Div(
+                    html.A(
+                        header_icon("github", title="https://github.com/half-man-half-potato/cv"),
+                        style={"textAlign": "center", "position": "absolute", "left": "80px", "top": "0px", "zIndex": 1},
+                        href="https://github.com/half-man-half-potato/cv",
+                        target="_blank"
+                    )
+                ),
+                html.Div(
+                    html.A(
+                        header_icon("link", title="more links here: https://yuryulasenka.wixsite.com/resume"),
+                        style={"textAlign": "center", "position": "absolute", "left": "115px", "top": "0px", "zIndex": 1},
+                        href="https://yuryulasenka.wixsite.com/resume",
+                        target="_blank"
+                    )
+                ),
+                html.Div(
+                    html.A(
+                        header_icon("pdf", title="download a PDF resume/CV"),
+                        style={"textAlign": "center", "position": "absolute", "left": "150px", "top": "0px", "zIndex": 1},
+                        href=cv_pdf_url,
+                        download="Yury Ulasenka - CV.pdf",
+                        target="_blank"
+                    )
                 )
-            )
-        ],
-        style={"position": "relative", "left": "1165px", "top": "10px", "width": "175px", "zIndex": 1},
-    )
+            ],
+            style={"position": "relative", "left": "1165px", "top": "10px", "width": "175px", "zIndex": 1},
+        ),
+
+
+        *([dcc.Store(id="crossfilter-store", data=crossfilter_store_data())] if CLIENTSIDE_MODE else []),
+        *[dcc.Store(id=f"{table}-rows", data=None) for table in paged_tables],
+        dcc.Store(id="selection", data=None), # current selection: {"operator": None / "and" / "or", "items": [[dimension, value], ...]}
+        dcc.Store(id="selection-modifier", data=None), # modifier of the last click (assets/multiselect.js)
+        dcc.Store(id="page-view", data=None), # random id of the page view, for request coalescing (assets/coalesce.js)
+    ])
+
+
+def serve_layout():
+    # the layout reflects the current data snapshot, built once per snapshot
+    data = dataset()
+    if "layout" not in data.rendered:
+        data.rendered["layout"] = build_layout()
+    return data.rendered["layout"]
+
+
+app.layout = serve_layout
+
+
+#########################################################################################################################################################
+################################################################### INSTRUMENTATION #####################################################################
+#########################################################################################################################################################
+
+
+# Logging: records are handed over to a background thread (no blocking stdout I/O in the callbacks) and sampled
+class SampledFilter(logging.Filter):
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or not getattr(record, "sampled", True) or random.random() < self.rate
+
+
+def start_log_listener():
+    global log_queue, log_listener
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, logging.StreamHandler())
+    log_listener.start()
+
+
+start_log_listener()
+atexit.register(lambda: log_listener.stop())
+
+logger = logging.getLogger("cv")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+logger.addHandler(QueueHandler(log_queue))
+logger.addFilter(SampledFilter(float(os.environ.get("CV_LOG_SAMPLE_RATE", 0.1))))
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # the last one is +Inf
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[next((i for i, bucket in enumerate(self.buckets) if value <= bucket), len(self.buckets))] += 1
+        self.sum += value
+
+    def prometheus_lines(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bucket, count in zip([*self.buckets, "+Inf"], self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bucket}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return lines
+
+    @classmethod
+    def merged(cls, buckets, states):
+        # the sum of histograms given as (counts, sum), e.g. of several worker processes
+        histogram = cls(buckets)
+        for counts, total in states:
+            histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+            histogram.sum += total
+        return histogram
+
+
+class CallbackMetrics:
+    """Thread-safe callback latency, trigger, PreventUpdate and response size metrics, exported in the Prometheus text format."""
+
+    latency_buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+    size_buckets = (1_000, 4_000, 16_000, 64_000, 256_000, 1_000_000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {} # handler -> Histogram
+        self.triggers = {} # triggering component id -> count
+        self.prevented = {} # handler -> count
+        self.superseded = {} # triggering component id -> count
+        self.response_bytes = {} # triggering component id -> Histogram
+
+    def observe_latency(self, callback, seconds):
+        with self._lock:
+            self.latency.setdefault(callback, Histogram(self.latency_buckets)).observe(seconds)
+
+    def count_trigger(self, trigger):
+        with self._lock:
+            self.triggers[trigger] = self.triggers.get(trigger, 0) + 1
+
+    def count_prevented(self, callback):
+        with self._lock:
+            self.prevented[callback] = self.prevented.get(callback, 0) + 1
+
+    def count_superseded(self, trigger):
+        with self._lock:
+            self.superseded[trigger] = self.superseded.get(trigger, 0) + 1
+
+    def observe_response_size(self, trigger, size):
+        with self._lock:
+            self.response_bytes.setdefault(trigger, Histogram(self.size_buckets)).observe(size)
+
+    def snapshot(self):
+        # the metrics of this process as plain (JSON) data, to be added up with those of the other worker processes
+        with self._lock:
+            return {
+                "latency": {callback: [list(h.counts), h.sum] for callback, h in self.latency.items()},
+                "triggers": dict(self.triggers),
+                "prevented": dict(self.prevented),
+                "superseded": dict(self.superseded),
+                "response_bytes": {trigger: [list(h.counts), h.sum] for trigger, h in self.response_bytes.items()},
+                "figure_cache": figure_cache.stats(),
+                "memory": process_memory(),
+                "pid": os.getpid(),
+                "time": time.time(),
+            }
+
+
+def merged_counts(snapshots, key):
+    counts = {}
+    for snapshot in snapshots:
+        for name, count in snapshot[key].items():
+            counts[name] = counts.get(name, 0) + count
+    return sorted(counts.items())
+
+
+def merged_histograms(snapshots, key, buckets):
+    states = {}
+    for snapshot in snapshots:
+        for name, state in snapshot[key].items():
+            states.setdefault(name, []).append(state)
+    return sorted((name, Histogram.merged(buckets, states)) for name, states in states.items())
+
+
+def prometheus_text(snapshots):
+    # counters and histograms are added up across the processes; gauges (memory, cache size) are per process, labelled with
+    # the pid, of the live processes only (see METRICS OF A PREFORK SERVER)
+    live = [snapshot for snapshot in snapshots if snapshot.get("live", True)]
+    lines = [
+        "# HELP cv_callback_latency_seconds Latency of the callback handlers.",
+        "# TYPE cv_callback_latency_seconds histogram",
+    ]
+    for callback, histogram in merged_histograms(snapshots, "latency", CallbackMetrics.latency_buckets):
+        lines += histogram.prometheus_lines("cv_callback_latency_seconds", f'callback="{callback}"')
+    lines += [
+        "# HELP cv_callback_triggers_total Callback requests by the triggering component.",
+        "# TYPE cv_callback_triggers_total counter",
+    ]
+    lines += [f'cv_callback_triggers_total{{trigger="{trigger}"}} {count}' for trigger, count in merged_counts(snapshots, "triggers")]
+    lines += [
+        "# HELP cv_callback_prevented_total Callback handlers that raised PreventUpdate.",
+        "# TYPE cv_callback_prevented_total counter",
+    ]
+    lines += [f'cv_callback_prevented_total{{callback="{callback}"}} {count}' for callback, count in merged_counts(snapshots, "prevented")]
+    lines += [
+        "# HELP cv_callback_superseded_total Crossfilter requests stopped early because a newer click of the same page view started.",
+        "# TYPE cv_callback_superseded_total counter",
+    ]
+    lines += [f'cv_callback_superseded_total{{trigger="{trigger}"}} {count}' for trigger, count in merged_counts(snapshots, "superseded")]
+    lines += [
+        "# HELP cv_callback_response_bytes Size of the callback responses as sent (after compression).",
+        "# TYPE cv_callback_response_bytes histogram",
+    ]
+    for trigger, histogram in merged_histograms(snapshots, "response_bytes", CallbackMetrics.size_buckets):
+        lines += histogram.prometheus_lines("cv_callback_response_bytes", f'trigger="{trigger}"')
+
+    memory = [snapshot for snapshot in live if snapshot["memory"] is not None]
+    if memory:
+        lines += [
+            "# HELP cv_process_memory_bytes Resident memory of a process: shared with other processes (e.g. forked workers) or private.",
+            "# TYPE cv_process_memory_bytes gauge",
+            *[f'cv_process_memory_bytes{{pid="{snapshot["pid"]}",kind="{kind}"}} {value}' for snapshot in memory for kind, value in snapshot["memory"].items()],
+        ]
+
+    cache_events = {"hit": "hits", "miss": "misses", "eviction": "evictions"}
+    lines += [
+        "# HELP cv_figure_cache_events_total Figure cache hits, misses and evictions.",
+        "# TYPE cv_figure_cache_events_total counter",
+        *[f'cv_figure_cache_events_total{{event="{event}"}} {sum(snapshot["figure_cache"][key] for snapshot in snapshots)}' for event, key in cache_events.items()],
+        "# HELP cv_figure_cache_size Figures in the figure cache of a process.",
+        "# TYPE cv_figure_cache_size gauge",
+        *[f'cv_figure_cache_size{{pid="{snapshot["pid"]}"}} {snapshot["figure_cache"]["size"]}' for snapshot in live],
+    ]
+    return "\n".join(lines) + "\n"
+
+
+callback_metrics = CallbackMetrics()
+
+
+def process_memory():
+    # resident memory in bytes, split into pages shared with other processes and private ones (Linux only, else None)
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = {line.split(":")[0]: int(line.split()[1]) * 1024 for line in f if line.rstrip().endswith("kB")}
+    except OSError:
+        return None
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "shared": fields["Shared_Clean"] + fields["Shared_Dirty"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def memory_report():
+    memory = process_memory()
+    if memory is None:
+        return f"pid {os.getpid()}: memory report is not available on this platform"
+    return f"pid {os.getpid()}: " + ", ".join(f"{kind} {value / 2**20:.1f} MB" for kind, value in memory.items())
+
+
+# Prefork servers (e.g. gunicorn --preload): the data, caches and figures are built once in the master and shared copy-on-write.
+# A forked worker inherits the master's locks (possibly held at fork time) and queues, but none of its threads.
+def reinitialize_after_fork():
+    global callback_metrics, compressed_bodies_lock, reload_lock, figure_pool, figure_pool_slots
+    figure_cache._lock = threading.Lock()
+    compressed_bodies_lock = threading.Lock()
+    reload_lock = threading.Lock()
+    if figure_pool is not None: # the pool threads are not inherited
+        figure_pool = ThreadPoolExecutor(max_workers=ASYNC_WORKERS, thread_name_prefix="figures")
+    figure_pool_slots = threading.BoundedSemaphore(ASYNC_WORKERS + ASYNC_QUEUE)
+    callback_metrics = CallbackMetrics() # the worker's own metrics, added up with those of the other workers by /metrics
+    start_metrics_writer()
+    start_log_listener()
+    for handler in logger.handlers:
+        if isinstance(handler, QueueHandler):
+            handler.queue = log_queue
+    start_data_watcher()
+
+
+os.register_at_fork(after_in_child=reinitialize_after_fork)
+
+
+@app.server.after_request
+def record_callback_response_size(response):
+    if request.path.endswith("/_dash-update-component"):
+        callback_metrics.observe_response_size(g.get("callback_trigger", "none"), len(response.get_data()))
+    return response
+
+
+# Metrics of a prefork server: a scrape of /metrics reaches any one of the workers. With CV_METRICS_DIR (gunicorn.conf.py sets
+# it), every worker writes its metrics to its own file in that directory every CV_METRICS_FLUSH_INTERVAL seconds and before it
+# answers a scrape, and /metrics adds up the files of all workers, so the counters stay monotonic whichever worker answers.
+# The files of exited workers are kept, so that their counts stay in the totals; their gauges are left out once the file is
+# older than 3 flush intervals. Without CV_METRICS_DIR, /metrics shows the metrics of the process that answers.
+METRICS_DIR = os.environ.get("CV_METRICS_DIR")
+METRICS_FLUSH_INTERVAL = float(os.environ.get("CV_METRICS_FLUSH_INTERVAL", 5))
+metrics_file = None # this worker's file in METRICS_DIR
+
+
+def write_metrics():
+    path = metrics_file
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(callback_metrics.snapshot(), f)
+    os.replace(f"{path}.tmp", path) # atomic: a scrape never reads a partly written file
+
+
+def metrics_writer():
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        try:
+            write_metrics()
+        except OSError:
+            logger.warning("cannot write the metrics to %s", metrics_file, exc_info=True)
+
+
+def start_metrics_writer():
+    # called in each forked worker: a new file (not one per pid, as an exited worker's pid may be reused)
+    global metrics_file
+    if METRICS_DIR:
+        metrics_file = os.path.join(METRICS_DIR, f"worker-{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+        write_metrics()
+        threading.Thread(target=metrics_writer, name="metrics-writer", daemon=True).start()
+        atexit.register(write_metrics)
+
+
+def worker_snapshots():
+    write_metrics()
+    snapshots = []
+    for path in glob.glob(os.path.join(METRICS_DIR, "worker-*.json")):
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError): # removed meanwhile
+            continue
+        snapshot["live"] = time.time() - snapshot["time"] < 3 * METRICS_FLUSH_INTERVAL
+        snapshots.append(snapshot)
+    return snapshots
+
+
+@app.server.route("/metrics")
+def metrics():
+    snapshots = worker_snapshots() if metrics_file is not None else [callback_metrics.snapshot()]
+    return Response(prometheus_text(snapshots), mimetype="text/plain; version=0.0.4")
+
+
+#########################################################################################################################################################
+####################################################################### DELIVERY ########################################################################
+#########################################################################################################################################################
 
 
-])
+# Responses are compressed (brotli if installed, else gzip); GET responses (index, layout, dependencies, component suites) get a
+# content hash ETag, so repeat visitors get 304s. Registered after the metrics hook, so it runs before it (Flask runs them in reverse).
+compressible_mimetypes = {"application/json", "text/html", "text/css", "text/plain", "application/javascript", "text/javascript", "image/svg+xml"}
+compress_min_bytes = int(os.environ.get("CV_COMPRESS_MIN_BYTES", 1024))
+compressed_bodies = OrderedDict() # (ETag) -> compressed body of a GET response, as these repeat across sessions
+compressed_bodies_lock = threading.Lock()
+
+
+def response_encoding(accept_encoding, size):
+    if size < compress_min_bytes:
+        return None
+    if brotli is not None and "br" in accept_encoding:
+        return "br"
+    if "gzip" in accept_encoding:
+        return "gzip"
+    return None
+
+
+def compress(body, encoding):
+    return brotli.compress(body, quality=5) if encoding == "br" else gzip.compress(body, compresslevel=6)
+
+
+def compressed_get_body(etag, body, encoding):
+    with compressed_bodies_lock:
+        if etag in compressed_bodies:
+            compressed_bodies.move_to_end(etag)
+            return compressed_bodies[etag]
+    compressed = compress(body, encoding)
+    with compressed_bodies_lock:
+        compressed_bodies[etag] = compressed
+        while len(compressed_bodies) > 64:
+            compressed_bodies.popitem(last=False)
+    return compressed
+
+
+@app.server.after_request
+def compress_and_validate(response):
+    if response.direct_passthrough or response.status_code != 200 or response.content_encoding or response.mimetype not in compressible_mimetypes:
+        return response # e.g. files from /assets/, which Flask serves with their own ETags and conditional responses
+
+    body = response.get_data()
+    encoding = response_encoding(request.headers.get("Accept-Encoding", ""), len(body))
+    response.vary.add("Accept-Encoding")
+
+    if request.method == "GET":
+        etag = hashlib.sha256(body).hexdigest()[:32] + (f"-{encoding}" if encoding else "") # one ETag per representation
+        if "Cache-Control" not in response.headers: # fingerprinted component suites are already cached for a year
+            response.headers["Cache-Control"] = "no-cache" # i.e. revalidate with the ETag
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers={"ETag": f'"{etag}"', "Vary": response.headers["Vary"], "Cache-Control": response.headers["Cache-Control"]})
+        response.set_etag(etag)
+        if encoding:
+            response.set_data(compressed_get_body(etag, body, encoding))
+    elif encoding:
+        response.set_data(compress(body, encoding))
+
+    if encoding:
+        response.content_encoding = encoding
+    return response
 
 
 #########################################################################################################################################################
@@ -517,74 +1784,127 @@ app.layout = html.Div([
 #__________________________________________________
 
 
-global callback_counter
-callback_counter = 0
+# The handlers below are not registered as separate callbacks: a single dispatcher callback (see DISPATCHER) routes each click
+# to the handlers of the clicked element and returns all of their outputs in one response
+dispatch_routes = {} # triggering component id -> [(handler, output keys, input keys)]
+
+
+def dispatched(*dependencies):
+    # the first Input triggers the handler, the other Inputs are passed to it as the dispatcher's States
+    def decorator(function):
+        outputs = [f"{dependency.component_id}.{dependency.component_property}" for dependency in dependencies if isinstance(dependency, Output)]
+        inputs = [f"{dependency.component_id}.{dependency.component_property}" for dependency in dependencies if isinstance(dependency, Input)]
+        dispatch_routes.setdefault(inputs[0].split(".")[0], []).append((function, outputs, inputs))
+        return function
+    return decorator
+
+
+# Multi-selection: a Ctrl/Cmd-click (intersection) or Shift-click (union) adds the clicked item to the current selection (kept in the
+# "selection" store), or removes it if it is already selected; assets/multiselect.js records the modifier of every click in the
+# "selection-modifier" store. Every view then shows what is related to all / any of the selected items (see selected_values).
+def next_selection(selection, modifier, dimension, value):
+    # the selection after a click on (dimension, value): the item alone on a plain click, else the item toggled in the selection
+    item = [dimension, value]
+    items = (selection or {}).get("items", [])
+    if modifier not in ("and", "or") or not items:
+        return {"operator": None, "items": [item]}
+    if item not in items:
+        items = items + [item]
+    elif len(items) > 1:
+        items = [selected for selected in items if selected != item]
+    return {"operator": modifier, "items": items}
+
+
+def compound_outputs(source, selection):
+    # the outputs of the source's update callback for a compound selection: the clicked table keeps its rows and highlights
+    # the selected / related ones, the other tables are filtered or highlighted as on a single selection
+    filtered_achievements = related("Selection", selection, "Achievement")
+    filtered_tasks = related("Selection", selection, "Task")
+
+    return (
+            gantt_output(selected_items=selection), # 1
+            table_highlight("projects-table", "Client_Order", related("Selection", selection, "Client_Order")), # 2
+            table_highlight("roles-table", "Role", related("Selection", selection, "Role")), # 3
+            table_highlight("achievements-table", "Achievement", filtered_achievements) if source == "achievements"
+            else [{"Achievement": achievement} for achievement in filtered_achievements], # 4
+            table_highlight("tasks-table", "Task", filtered_tasks) if source == "tasks"
+            else [{"Task": task} for task in filtered_tasks], # 5
+            wordcloud_output(selected_items=selection) # 6
+            )
+
+
+def selection_update(source, dimension, value, active_cell_row, modifier, selection):
+    # outputs of the source's update callback + the new selection
+    selection = next_selection(selection, modifier, dimension, value)
+    if selection["operator"] is None:
+        return (*selection_outputs(source, value, active_cell_row), selection)
+    compound = Selection(selection["operator"], tuple(tuple(item) for item in selection["items"]))
+    return (*compound_outputs(source, compound), selection)
 
 
 # 1.a. deactivate/unselect active/selected cells in other elements
-@app.callback(
-    Output("roles-table", "active_cell", allow_duplicate=True),
-    Output("roles-table", "selected_cells", allow_duplicate=True),
-    Output("achievements-table", "active_cell", allow_duplicate=True),
-    Output("achievements-table", "selected_cells", allow_duplicate=True),
-    Output("tasks-table", "active_cell", allow_duplicate=True),
-    Output("tasks-table", "selected_cells", allow_duplicate=True),
-    Input("projects-table", "active_cell"),
-    prevent_initial_call=True
+@dispatched(
+    Output("roles-table", "active_cell"),
+    Output("roles-table", "selected_cells"),
+    Output("achievements-table", "active_cell"),
+    Output("achievements-table", "selected_cells"),
+    Output("tasks-table", "active_cell"),
+    Output("tasks-table", "selected_cells"),
+    Input("projects-table", "active_cell")
 )
 def projects_table_deactivate(active_cell):
-    global callback_counter
-    callback_counter += 1
-
     if active_cell is None: # if triggered by a chained callback instead, do not update the callback output(s) and exit the function
-        print(f'{callback_counter}.: projects_table_deactivate: active_cell is {active_cell}')
+        logger.info(f'projects_table_deactivate: active_cell is {active_cell}')
         raise PreventUpdate ## 1-6
 
-    print(f'{callback_counter}.: projects_table_deactivate: active_cell is NOT None')
+    logger.info('projects_table_deactivate: active_cell is NOT None')
     return None, [], None, [], None, []
 
 
 # 1-b. update formatting in other elements
-@app.callback(
-    Output("gantt-chart", "figure", allow_duplicate=True), # 1. Gantt
-    Output("projects-table", "style_data_conditional", allow_duplicate=True), # 2. Projects
-    Output("roles-table", "style_data_conditional", allow_duplicate=True), # 3. Roles
-    Output("achievements-table", "data", allow_duplicate=True), # 4. Achievements
-    Output("tasks-table", "data", allow_duplicate=True), # 5. Tasks
-    Output("word-cloud", "figure", allow_duplicate=True),  # 6. Word cloud
+@dispatched(
+    Output("gantt-chart", "figure"), # 1. Gantt
+    Output("projects-table", "style_data_conditional"), # 2. Projects
+    Output("roles-table", "style_data_conditional"), # 3. Roles
+    Output("achievements-table", "data"), # 4. Achievements
+    Output("tasks-table", "data"), # 5. Tasks
+    Output("word-cloud", "figure"),  # 6. Word cloud
+    Output("selection", "data"), # 7. Selection
     Input("projects-table", "active_cell"),
     Input("projects-table", "data"),
-    prevent_initial_call=True
+    Input("selection-modifier", "data"),
+    Input("selection", "data")
 )
-def projects_table_update(active_cell, data):
-    global callback_counter
-    callback_counter += 1
-
+def projects_table_update(active_cell, data, modifier, selection):
     if active_cell is None: # if triggered by a chained callback instead, do not update the callback output(s) and exit the function
-        print(f'{callback_counter}.: projects_table_update: active_cell is {active_cell}')
+        logger.info(f'projects_table_update: active_cell is {active_cell}')
         raise PreventUpdate ## 1-6
 
     active_cell_row = active_cell["row"]
     selected_client_order = data[active_cell_row]["Client_Order"]
 
-    clients_style_conditional = [{"if": {"row_index": active_cell_row}, "backgroundColor": "lightblue"}]
+    logger.info('projects_table_update: active_cell is NOT None')
 
-    related_roles = df[df["Client_Order"] == selected_client_order]["Role"].unique()
-    roles_style_conditional = [{"if": {"filter_query": f'{{Role}} = "{role}"'}, "backgroundColor": "lightblue"} for role in related_roles]
+    return selection_update("projects", "Client_Order", selected_client_order, active_cell_row, modifier, selection)
 
-    filtered_achievements = df[df["Client_Order"] == selected_client_order]["Achievement"].drop_duplicates().dropna().sort_values()
 
-    filtered_tasks = df[df["Client_Order"] == selected_client_order]["Task"].drop_duplicates().sort_values()
+def projects_table_outputs(selected_client_order, active_cell_row):
+    clients_style_conditional = table_highlight("projects-table", "Client_Order", row=active_cell_row)
 
-    print(f'{callback_counter}.: projects_table_update: active_cell is NOT None')
+    related_roles = related("Client_Order", selected_client_order, "Role")
+    roles_style_conditional = table_highlight("roles-table", "Role", related_roles)
+
+    filtered_achievements = related("Client_Order", selected_client_order, "Achievement")
+
+    filtered_tasks = related("Client_Order", selected_client_order, "Task")
 
     return (
-            create_gantt(selected_client_order=selected_client_order), # 1
-            clients_style + clients_style_conditional, # 2
-            roles_style + roles_style_conditional, # 3
-            pd.DataFrame({"Achievement": filtered_achievements}).sort_index().to_dict("records"), # 4
-            pd.DataFrame({"Task": filtered_tasks}).sort_index().to_dict("records"), # 5
-            create_wordcloud(selected_client_order=selected_client_order) # 6
+            gantt_output(selected_client_order=selected_client_order), # 1
+            clients_style_conditional, # 2
+            roles_style_conditional, # 3
+            [{"Achievement": achievement} for achievement in filtered_achievements], # 4
+            [{"Task": task} for task in filtered_tasks], # 5
+            wordcloud_output(selected_client_order=selected_client_order) # 6
             )
 
 
@@ -594,69 +1914,68 @@ def projects_table_update(active_cell, data):
 
 
 # 2.a. deactivate/unselect active/selected cells in other elements
-@app.callback(
-    Output("projects-table", "active_cell", allow_duplicate=True),
-    Output("projects-table", "selected_cells", allow_duplicate=True),
-    Output("achievements-table", "active_cell", allow_duplicate=True),
-    Output("achievements-table", "selected_cells", allow_duplicate=True),
-    Output("tasks-table", "active_cell", allow_duplicate=True),
-    Output("tasks-table", "selected_cells", allow_duplicate=True),
-    Input("roles-table", "active_cell"),
-    prevent_initial_call=True
+@dispatched(
+    Output("projects-table", "active_cell"),
+    Output("projects-table", "selected_cells"),
+    Output("achievements-table", "active_cell"),
+    Output("achievements-table", "selected_cells"),
+    Output("tasks-table", "active_cell"),
+    Output("tasks-table", "selected_cells"),
+    Input("roles-table", "active_cell")
 )
 def roles_table_deactivate(active_cell):
-    global callback_counter
-    callback_counter += 1
-
     if active_cell is None: # if triggered by a chained callback instead, do not update the callback output(s) and exit the function
-        print(f'{callback_counter}.: roles_table_deactivate: active_cell is {active_cell}')
+        logger.info(f'roles_table_deactivate: active_cell is {active_cell}')
         raise PreventUpdate ## 1-6
 
-    print(f'{callback_counter}.: roles_table_deactivate: active_cell is NOT None')
+    logger.info('roles_table_deactivate: active_cell is NOT None')
     return None, [], None, [], None, []
 
 
 # 2.b. update formatting in other elements
-@app.callback(
-    Output("gantt-chart", "figure", allow_duplicate=True),  # 1. Gantt
-    Output("projects-table", "style_data_conditional", allow_duplicate=True),  # 2. Client
-    Output("roles-table", "style_data_conditional", allow_duplicate=True), # 3. Roles
-    Output("achievements-table", "data", allow_duplicate=True),  # 4. Achievements
-    Output("tasks-table", "data", allow_duplicate=True),  # 5. Tasks
-    Output("word-cloud", "figure", allow_duplicate=True),  # 6. Word cloud
+@dispatched(
+    Output("gantt-chart", "figure"),  # 1. Gantt
+    Output("projects-table", "style_data_conditional"),  # 2. Client
+    Output("roles-table", "style_data_conditional"), # 3. Roles
+    Output("achievements-table", "data"),  # 4. Achievements
+    Output("tasks-table", "data"),  # 5. Tasks
+    Output("word-cloud", "figure"),  # 6. Word cloud
+    Output("selection", "data"), # 7. Selection
     Input("roles-table", "active_cell"),
     Input("roles-table", "data"),
-    prevent_initial_call=True
+    Input("selection-modifier", "data"),
+    Input("selection", "data")
 )
-def roles_table_update(active_cell, data):
-    global callback_counter
-    callback_counter += 1
-
+def roles_table_update(active_cell, data, modifier, selection):
     if active_cell is None: # if triggered by a chained callback instead, do not update the callback output(s) and exit the function
-        print(f'{callback_counter}.: roles_table_update: active_cell is {active_cell}')
+        logger.info(f'roles_table_update: active_cell is {active_cell}')
         raise PreventUpdate ## 1-6
 
     active_cell_row = active_cell["row"]
     selected_role = data[active_cell_row]["Role"]
 
-    related_client_orders = df[df["Role"] == selected_role]["Client_Order"].unique()
-    clients_style_conditional = [{"if": {"filter_query": f'{{Client_Order}} = "{order}"'}, "backgroundColor": "lightblue"} for order in related_client_orders]
+    logger.info('roles_table_update: active_cell is NOT None')
+
+    return selection_update("roles", "Role", selected_role, None, modifier, selection)
+
 
-    roles_style_conditional = [{"if": {"filter_query": f'{{Role}} = "{selected_role}"'}, "backgroundColor": "lightblue"}]
+def roles_table_outputs(selected_role, active_cell_row=None):
+    related_client_orders = related("Role", selected_role, "Client_Order")
+    clients_style_conditional = table_highlight("projects-table", "Client_Order", related_client_orders)
 
-    filtered_achievements = df_role_to_achievement[df_role_to_achievement["Role"] == selected_role]["Achievement"].drop_duplicates().dropna().sort_values()
+    roles_style_conditional = table_highlight("roles-table", "Role", [selected_role])
 
-    filtered_tasks = df_role_to_task[df_role_to_task["Role"] == selected_role]["Task"].drop_duplicates().sort_values()
+    filtered_achievements = related("Role", selected_role, "Achievement")
 
-    print(f'{callback_counter}.: roles_table_update: active_cell is NOT None')
+    filtered_tasks = related("Role", selected_role, "Task")
 
     return (
-            create_gantt(selected_role=selected_role),  # 1
-            clients_style + clients_style_conditional, # 2
-            roles_style + roles_style_conditional, # 3
-            pd.DataFrame({"Achievement": filtered_achievements}).sort_index().to_dict("records"),  # 4
-            pd.DataFrame({"Task": filtered_tasks}).sort_index().to_dict("records"),  # 5
-            create_wordcloud(selected_role=selected_role)  # 6
+            gantt_output(selected_role=selected_role),  # 1
+            clients_style_conditional, # 2
+            roles_style_conditional, # 3
+            [{"Achievement": achievement} for achievement in filtered_achievements],  # 4
+            [{"Task": task} for task in filtered_tasks],  # 5
+            wordcloud_output(selected_role=selected_role)  # 6
             )
 
 
@@ -666,70 +1985,70 @@ def roles_table_update(active_cell, data):
 
 
 # 3.a. deactivate/unselect active/selected cells in other elements
-@app.callback(
-    Output("projects-table", "active_cell", allow_duplicate=True),
-    Output("projects-table", "selected_cells", allow_duplicate=True),
-    Output("roles-table", "active_cell", allow_duplicate=True),
-    Output("roles-table", "selected_cells", allow_duplicate=True),
-    Output("achievements-table", "active_cell", allow_duplicate=True),
-    Output("achievements-table", "selected_cells", allow_duplicate=True),
-    Output("tasks-table", "active_cell", allow_duplicate=True),
-    Output("tasks-table", "selected_cells", allow_duplicate=True),
-    Input("word-cloud", "clickData"),
-    prevent_initial_call=True
+@dispatched(
+    Output("projects-table", "active_cell"),
+    Output("projects-table", "selected_cells"),
+    Output("roles-table", "active_cell"),
+    Output("roles-table", "selected_cells"),
+    Output("achievements-table", "active_cell"),
+    Output("achievements-table", "selected_cells"),
+    Output("tasks-table", "active_cell"),
+    Output("tasks-table", "selected_cells"),
+    Input("word-cloud", "clickData")
 )
 def word_cloud_deactivate(clickData):
-    global callback_counter
-    callback_counter += 1
-
     if clickData is None: # if triggered by a chained callback instead, do not update the callback output(s) and exit the function
-        print(f'{callback_counter}.: word_cloud_deactivate: clickData is {clickData}')
+        logger.info(f'word_cloud_deactivate: clickData is {clickData}')
         raise PreventUpdate
 
-    print(f'{callback_counter}.: word_cloud_deactivate: clickData is NOT None')
+    logger.info('word_cloud_deactivate: clickData is NOT None')
     return None, [], None, [], None, [], None, []
 
 
 # 3.b. update formatting in other elements
-@app.callback(
-    Output("gantt-chart", "figure", allow_duplicate=True),  # 1 Gantt
-    Output("projects-table", "style_data_conditional", allow_duplicate=True), # 2 Clients
-    Output("roles-table", "style_data_conditional", allow_duplicate=True),  # 3 Roles
-    Output("achievements-table", "data", allow_duplicate=True),  # 4. Achievements
-    Output("tasks-table", "data", allow_duplicate=True),  # 5. Tasks
-    Output("word-cloud", "figure", allow_duplicate=True),  # 6. Word cloud
+@dispatched(
+    Output("gantt-chart", "figure"),  # 1 Gantt
+    Output("projects-table", "style_data_conditional"), # 2 Clients
+    Output("roles-table", "style_data_conditional"),  # 3 Roles
+    Output("achievements-table", "data"),  # 4. Achievements
+    Output("tasks-table", "data"),  # 5. Tasks
+    Output("word-cloud", "figure"),  # 6. Word cloud
+    Output("selection", "data"), # 7. Selection
     Input("word-cloud", "clickData"),
-    prevent_initial_call=True
+    Input("selection-modifier", "data"),
+    Input("selection", "data")
 )
-def word_cloud_update(clickData):
-    global callback_counter
-    callback_counter += 1
-
+def word_cloud_update(clickData, modifier, selection):
     if clickData is None:
-        print(f'{callback_counter}.: word_cloud_update: clickData is {clickData}')
+        logger.info(f'word_cloud_update: clickData is {clickData}')
         raise PreventUpdate ##1-6
 
-    print(f'{callback_counter}.: word_cloud_update: clickData is NOT None')
+    logger.info('word_cloud_update: clickData is NOT None')
 
     selected_tool = clickData["points"][0]["text"]
-    related_client_orders = df[df["Tool"] == selected_tool]["Client_Order"].drop_duplicates().tolist()
 
-    clients_style_conditional = [{"if": {"filter_query": f'{{Client_Order}} = "{order}"'}, "backgroundColor": "lightblue"} for order in related_client_orders]
+    return selection_update("word_cloud", "Tool", selected_tool, None, modifier, selection)
+
+
+def word_cloud_outputs(selected_tool, active_cell_row=None):
+    related_client_orders = related("Tool", selected_tool, "Client_Order")
+
+    clients_style_conditional = table_highlight("projects-table", "Client_Order", related_client_orders)
 
-    related_roles = df_role_to_tool[df_role_to_tool["Tool"] == selected_tool]["Role"].unique()
-    roles_style_conditional = [{"if": {"filter_query": f'{{Role}} = "{role}"'}, "backgroundColor": "lightblue"} for role in related_roles]
+    related_roles = related("Tool", selected_tool, "Role")
+    roles_style_conditional = table_highlight("roles-table", "Role", related_roles)
 
-    filtered_achievements = df[df["Tool"] == selected_tool]["Achievement"].drop_duplicates().dropna().sort_values()
+    filtered_achievements = related("Tool", selected_tool, "Achievement")
 
-    filtered_tasks = df[df["Tool"] == selected_tool]["Task"].drop_duplicates().sort_values()
+    filtered_tasks = related("Tool", selected_tool, "Task")
 
     return (
-            create_gantt(selected_tool=selected_tool),  # 1
-            clients_style + clients_style_conditional, # 2
-            roles_style + roles_style_conditional,  # 3
-            pd.DataFrame({"Achievement": filtered_achievements}).sort_index().to_dict("records"),  # 4
-            pd.DataFrame({"Task": filtered_tasks}).sort_index().to_dict("records"),  # 5
-            create_wordcloud(selected_tool=selected_tool)  # 6
+            gantt_output(selected_tool=selected_tool),  # 1
+            clients_style_conditional, # 2
+            roles_style_conditional,  # 3
+            [{"Achievement": achievement} for achievement in filtered_achievements],  # 4
+            [{"Task": task} for task in filtered_tasks],  # 5
+            wordcloud_output(selected_tool=selected_tool)  # 6
             )
 
 
@@ -739,70 +2058,70 @@ def word_cloud_update(clickData):
 
 
 # 4.a. deactivate/unselect active/selected cells in other elements
-@app.callback(
-    Output("projects-table", "active_cell", allow_duplicate=True),
-    Output("projects-table", "selected_cells", allow_duplicate=True),
-    Output("roles-table", "active_cell", allow_duplicate=True),
-    Output("roles-table", "selected_cells", allow_duplicate=True),
-    Output("achievements-table", "active_cell", allow_duplicate=True),
-    Output("achievements-table", "selected_cells", allow_duplicate=True),
-    Input("tasks-table", "active_cell"),
-    prevent_initial_call=True
+@dispatched(
+    Output("projects-table", "active_cell"),
+    Output("projects-table", "selected_cells"),
+    Output("roles-table", "active_cell"),
+    Output("roles-table", "selected_cells"),
+    Output("achievements-table", "active_cell"),
+    Output("achievements-table", "selected_cells"),
+    Input("tasks-table", "active_cell")
 )
 def tasks_deactivate(active_cell):
-    global callback_counter
-    callback_counter += 1
-
     if active_cell is None: # if triggered by a chained callback instead, do not update the callback output(s) and exit the function
-        print(f'{callback_counter}.: tasks_deactivate: active_cell is {active_cell}')
+        logger.info(f'tasks_deactivate: active_cell is {active_cell}')
         raise PreventUpdate
 
-    print(f'{callback_counter}.: tasks_deactivate: active_cell is NOT None')
+    logger.info('tasks_deactivate: active_cell is NOT None')
     return None, [], None, [], None, []
 
 
 # 4.b. update formatting in other elements
-@app.callback(
-    Output("gantt-chart", "figure", allow_duplicate=True), # 1. Gantt
-    Output("projects-table", "style_data_conditional", allow_duplicate=True), # 2. Projects
-    Output("roles-table", "style_data_conditional", allow_duplicate=True), # 3. Roles
-    Output("achievements-table", "data", allow_duplicate=True), # 4. Achievements
-    Output("tasks-table", "style_data_conditional", allow_duplicate=True), # 5. Tasks
-    Output("word-cloud", "figure", allow_duplicate=True),  # 6. Word cloud
+@dispatched(
+    Output("gantt-chart", "figure"), # 1. Gantt
+    Output("projects-table", "style_data_conditional"), # 2. Projects
+    Output("roles-table", "style_data_conditional"), # 3. Roles
+    Output("achievements-table", "data"), # 4. Achievements
+    Output("tasks-table", "style_data_conditional"), # 5. Tasks
+    Output("word-cloud", "figure"),  # 6. Word cloud
+    Output("selection", "data"), # 7. Selection
     Input("tasks-table", "active_cell"),
     Input("tasks-table", "data"),
-    prevent_initial_call=True
+    Input("selection-modifier", "data"),
+    Input("selection", "data")
 )
-def tasks_update(active_cell, data):
-    global callback_counter
-    callback_counter += 1
-
+def tasks_update(active_cell, data, modifier, selection):
     if active_cell is None: # if triggered by a chained callback instead, do not update the callback output(s) and exit the function
-        print(f'{callback_counter}.: tasks_update: active_cell is {active_cell}')
+        logger.info(f'tasks_update: active_cell is {active_cell}')
         raise PreventUpdate ## 1-6
 
     active_cell_row = active_cell["row"]
     selected_task = data[active_cell_row]["Task"]
 
-    related_client_orders = df[df["Task"] == selected_task]["Client_Order"].unique()
-    clients_style_conditional = [{"if": {"filter_query": f'{{Client_Order}} = "{order}"'}, "backgroundColor": "lightblue"} for order in related_client_orders]
+    logger.info('tasks_update: active_cell is NOT None')
 
-    related_roles = df[df["Task"] == selected_task]["Role"].unique()
-    roles_style_conditional = [{"if": {"filter_query": f'{{Role}} = "{role}"'}, "backgroundColor": "lightblue"} for role in related_roles]
+    return selection_update("tasks", "Task", selected_task, active_cell_row, modifier, selection)
 
-    tasks_style_conditional = [{"if": {"row_index": active_cell_row}, "backgroundColor": "lightblue"}]
 
-    filtered_achievements = df_task_to_achievement[df_task_to_achievement["Task"] == selected_task]["Achievement"].drop_duplicates().dropna().sort_values()
+def tasks_outputs(selected_task, active_cell_row):
+    related_client_orders = related("Task", selected_task, "Client_Order")
+    clients_style_conditional = table_highlight("projects-table", "Client_Order", related_client_orders)
 
-    print(f'{callback_counter}.: tasks_update: active_cell is NOT None')
+    related_roles = related("Task", selected_task, "Role")
+    roles_style_conditional = table_highlight("roles-table", "Role", related_roles)
+
+    # the clicked row; by value in the paging mode, where the row index is only valid on the page that was clicked
+    tasks_style_conditional = table_highlight("tasks-table", "Task", [selected_task]) if "tasks-table" in paged_tables else table_highlight("tasks-table", "Task", row=active_cell_row)
+
+    filtered_achievements = related("Task", selected_task, "Achievement")
 
     return (
-            create_gantt(selected_task=selected_task), # 1
-            clients_style + clients_style_conditional, # 2
-            roles_style + roles_style_conditional, # 3
-            pd.DataFrame({"Achievement": filtered_achievements}).sort_index().to_dict("records"), # 4
-            clients_style + tasks_style_conditional, # 5
-            create_wordcloud(selected_task=selected_task) # 6
+            gantt_output(selected_task=selected_task), # 1
+            clients_style_conditional, # 2
+            roles_style_conditional, # 3
+            [{"Achievement": achievement} for achievement in filtered_achievements], # 4
+            tasks_style_conditional, # 5
+            wordcloud_output(selected_task=selected_task) # 6
             )
 
 
@@ -812,77 +2131,77 @@ def tasks_update(active_cell, data):
 
 
 # 5.a. deactivate/unselect active/selected cells in other elements
-@app.callback(
-    Output("projects-table", "active_cell", allow_duplicate=True),
-    Output("projects-table", "selected_cells", allow_duplicate=True),
-    Output("roles-table", "active_cell", allow_duplicate=True),
-    Output("roles-table", "selected_cells", allow_duplicate=True),
-    Output("tasks-table", "active_cell", allow_duplicate=True),
-    Output("tasks-table", "selected_cells", allow_duplicate=True),
-    Input("achievements-table", "active_cell"),
-    prevent_initial_call=True
+@dispatched(
+    Output("projects-table", "active_cell"),
+    Output("projects-table", "selected_cells"),
+    Output("roles-table", "active_cell"),
+    Output("roles-table", "selected_cells"),
+    Output("tasks-table", "active_cell"),
+    Output("tasks-table", "selected_cells"),
+    Input("achievements-table", "active_cell")
 )
 def achievements_deactivate(active_cell):
-    global callback_counter
-    callback_counter += 1
-
     if active_cell is None: # if triggered by a chained callback instead, do not update the callback output(s) and exit the function
-        print(f'{callback_counter}.: achievements_deactivate: active_cell is {active_cell}')
+        logger.info(f'achievements_deactivate: active_cell is {active_cell}')
         raise PreventUpdate
 
-    print(f'{callback_counter}.: achievements_deactivate: active_cell is NOT None')
+    logger.info('achievements_deactivate: active_cell is NOT None')
     return None, [], None, [], None, []
 
 
 # 5.b. update formatting in other elements
-@app.callback(
-    Output("gantt-chart", "figure", allow_duplicate=True), # 1. Gantt
-    Output("projects-table", "style_data_conditional", allow_duplicate=True), # 2. Projects
-    Output("roles-table", "style_data_conditional", allow_duplicate=True), # 3. Roles
-    Output("achievements-table", "style_data_conditional", allow_duplicate=True), # 4. ACHIEVEMENTS style
-    Output("tasks-table", "data", allow_duplicate=True), # 5. Tasks
-    Output("word-cloud", "figure", allow_duplicate=True),  # 6. Word cloud
-    # Output("achievements-table", "data", allow_duplicate=True), # 7. ACHIEVEMENTS (full) data
-    # Output("achievements-table", "active_cell", allow_duplicate=True),  # 8. ACHIEVEMENTS (new) active_cell
-    # Output("achievements-table", "selected_cells", allow_duplicate=True),  # 9. ACHIEVEMENTS (new) selected_cells (same as active_cell)
+@dispatched(
+    Output("gantt-chart", "figure"), # 1. Gantt
+    Output("projects-table", "style_data_conditional"), # 2. Projects
+    Output("roles-table", "style_data_conditional"), # 3. Roles
+    Output("achievements-table", "style_data_conditional"), # 4. ACHIEVEMENTS style
+    Output("tasks-table", "data"), # 5. Tasks
+    Output("word-cloud", "figure"),  # 6. Word cloud
+    # Output("achievements-table", "data"), # 7. ACHIEVEMENTS (full) data
+    # Output("achievements-table", "active_cell"),  # 8. ACHIEVEMENTS (new) active_cell
+    # Output("achievements-table", "selected_cells"),  # 9. ACHIEVEMENTS (new) selected_cells (same as active_cell)
+    Output("selection", "data"), # 10. Selection
     Input("achievements-table", "active_cell"),
     Input("achievements-table", "data"),
-    prevent_initial_call=True
+    Input("selection-modifier", "data"),
+    Input("selection", "data")
 )
-def achievements_update(active_cell, data):
-    global callback_counter
-    callback_counter += 1
-
+def achievements_update(active_cell, data, modifier, selection):
     if active_cell is None: # if triggered by a chained callback instead, do not update the callback output(s) and exit the function
-        print(f'{callback_counter}.: achievements_update: active_cell is {active_cell}')
+        logger.info(f'achievements_update: active_cell is {active_cell}')
         raise PreventUpdate
 
     active_cell_row = active_cell["row"]
     selected_achievement = data[active_cell_row]["Achievement"]
 
+    logger.info('achievements_update: active_cell is NOT None')
+
+    return selection_update("achievements", "Achievement", selected_achievement, active_cell_row, modifier, selection)
+
+
+def achievements_outputs(selected_achievement, active_cell_row):
     # active_cell_index = df_achievements.index[df_achievements["Achievement"] == selected_achievement].tolist()[0]
     # active_cell_row_new = df_achievements.index.get_loc(active_cell_index)
     # new_active_cell = {"row": active_cell_row_new, "column": 0, "column_id": "Achievement"}
 
-    related_client_orders = df[df["Achievement"] == selected_achievement]["Client_Order"].unique()
-    clients_style_conditional = [{"if": {"filter_query": f'{{Client_Order}} = "{order}"'}, "backgroundColor": "lightblue"} for order in related_client_orders]
-
-    related_roles = df[df["Achievement"] == selected_achievement]["Role"].unique()
-    roles_style_conditional = [{"if": {"filter_query": f'{{Role}} = "{role}"'}, "backgroundColor": "lightblue"} for role in related_roles]
+    related_client_orders = related("Achievement", selected_achievement, "Client_Order")
+    clients_style_conditional = table_highlight("projects-table", "Client_Order", related_client_orders)
 
-    achievements_style_conditional = [{"if": {"row_index": active_cell_row}, "backgroundColor": "lightblue"}]
+    related_roles = related("Achievement", selected_achievement, "Role")
+    roles_style_conditional = table_highlight("roles-table", "Role", related_roles)
 
-    filtered_tasks = df_task_to_achievement[df_task_to_achievement["Achievement"] == selected_achievement]["Task"].drop_duplicates().sort_values()
+    # the clicked row; by value in the paging mode, where the row index is only valid on the page that was clicked
+    achievements_style_conditional = table_highlight("achievements-table", "Achievement", [selected_achievement]) if "achievements-table" in paged_tables else table_highlight("achievements-table", "Achievement", row=active_cell_row)
 
-    print(f'{callback_counter}.: achievements_update: active_cell is NOT None')
+    filtered_tasks = related("Achievement", selected_achievement, "Task")
 
     return (
-            create_gantt(selected_achievement=selected_achievement), # 1
-            clients_style + clients_style_conditional, # 2
-            roles_style + roles_style_conditional, # 3
-            clients_style + achievements_style_conditional, # 4
-            pd.DataFrame({"Task": filtered_tasks}).sort_index().to_dict("records"), # 5
-            create_wordcloud(selected_achievement=selected_achievement), # 6
+            gantt_output(selected_achievement=selected_achievement), # 1
+            clients_style_conditional, # 2
+            roles_style_conditional, # 3
+            achievements_style_conditional, # 4
+            [{"Task": task} for task in filtered_tasks], # 5
+            wordcloud_output(selected_achievement=selected_achievement), # 6
             # df_achievements.to_dict("records"), # 7
             # new_active_cell, # 8
             # new_active_cell # 9
@@ -895,51 +2214,406 @@ def achievements_update(active_cell, data):
 
 
 # a. deactivate/unselect active/selected cells in other elements
-@app.callback(
-    Output("projects-table", "active_cell", allow_duplicate=True),
-    Output("projects-table", "selected_cells", allow_duplicate=True),
-    Output("roles-table", "active_cell", allow_duplicate=True),
-    Output("roles-table", "selected_cells", allow_duplicate=True),
-    Output("achievements-table", "active_cell", allow_duplicate=True),
-    Output("achievements-table", "selected_cells", allow_duplicate=True),
-    Output("tasks-table", "active_cell", allow_duplicate=True),
-    Output("tasks-table", "selected_cells", allow_duplicate=True),
-    Input("background", "n_clicks"),
-    prevent_initial_call=True
+@dispatched(
+    Output("projects-table", "active_cell"),
+    Output("projects-table", "selected_cells"),
+    Output("roles-table", "active_cell"),
+    Output("roles-table", "selected_cells"),
+    Output("achievements-table", "active_cell"),
+    Output("achievements-table", "selected_cells"),
+    Output("tasks-table", "active_cell"),
+    Output("tasks-table", "selected_cells"),
+    Input("background", "n_clicks")
 )
 def background_deactivate(n_clicks):
-    global callback_counter
-    callback_counter += 1
-
-    print(f'{callback_counter}.: clear_active_cell_deactivate')
+    logger.info('clear_active_cell_deactivate')
     return None, [], None, [], None, [], None, []
 
 
 # b. set formatting to default in other elements
-@app.callback(
-    Output("gantt-chart", "figure", allow_duplicate=True),  # 1. Gantt
-    Output("projects-table", "style_data_conditional", allow_duplicate=True),  # 2. Client
-    Output("roles-table", "style_data_conditional", allow_duplicate=True), # 3. Roles
-    Output("achievements-table", "data", allow_duplicate=True),  # 4.1 Achievements: data (remove filters)
-    Output("achievements-table", "style_data_conditional", allow_duplicate=True),  # 4.2 Achievements: formatting (remove highlighting)
-    Output("tasks-table", "data", allow_duplicate=True),  # 5.1 Tasks: data (remove filters)
-    Output("tasks-table", "style_data_conditional", allow_duplicate=True),  # 5.2 Tasks: formatting (remove highlighting)
-    Output("word-cloud", "figure", allow_duplicate=True),  # 6. Word cloud
-    Input("background", "n_clicks"),
-    prevent_initial_call=True
+@dispatched(
+    Output("gantt-chart", "figure"),  # 1. Gantt
+    Output("projects-table", "style_data_conditional"),  # 2. Client
+    Output("roles-table", "style_data_conditional"), # 3. Roles
+    Output("achievements-table", "data"),  # 4.1 Achievements: data (remove filters)
+    Output("achievements-table", "style_data_conditional"),  # 4.2 Achievements: formatting (remove highlighting)
+    Output("tasks-table", "data"),  # 5.1 Tasks: data (remove filters)
+    Output("tasks-table", "style_data_conditional"),  # 5.2 Tasks: formatting (remove highlighting)
+    Output("word-cloud", "figure"),  # 6. Word cloud
+    Output("selection", "data"), # 7. Selection (cleared)
+    Input("background", "n_clicks")
 )
 def background_update(n_clicks):
-    global callback_counter
-    callback_counter += 1
+    logger.info('clear_active_cell_update')
+    return (*selection_outputs("background"), None)
+
 
-    print(f'{callback_counter}.: clear_active_cell_update')
+def background_outputs(selected_value=None, active_cell_row=None):
+    data = dataset()
     return (
-            create_gantt(), # 1
-            clients_style, # 2
-            roles_style, # 3
-            df_achievements.to_dict("records"), # 4.1
-            clients_style,  # 4.2
-            df_tasks.to_dict("records"), # 5.1
-            clients_style,  # 5.2
-            create_wordcloud() # 6
+            gantt_output(), # 1
+            table_highlight("projects-table", "Client_Order"), # 2
+            table_highlight("roles-table", "Role"), # 3
+            data.df_achievements.to_dict("records"), # 4.1
+            table_highlight("achievements-table", "Achievement"),  # 4.2
+            data.df_tasks.to_dict("records"), # 5.1
+            table_highlight("tasks-table", "Task"),  # 5.2
+            wordcloud_output() # 6
             )
+
+
+#__________________________________________________
+# DISPATCHER: one callback for all of the above, so that a click is one request
+#__________________________________________________
+
+
+dispatch_outputs = list(dict.fromkeys(output for routes in dispatch_routes.values() for _, outputs, _ in routes for output in outputs))
+dispatch_triggers = list(dict.fromkeys(inputs[0] for routes in dispatch_routes.values() for _, _, inputs in routes))
+dispatch_states = list(dict.fromkeys(key for routes in dispatch_routes.values() for _, _, inputs in routes for key in inputs[1:]))
+
+
+def paged_keys(output):
+    # the callback outputs standing for a handler output: in the paging mode, the data of a paged table is replaced by its
+    # filtered index and a reset to the first page
+    component_id, component_property = output.split(".")
+    if component_id in paged_tables and component_property == "data":
+        return [f"{component_id}-rows.data", f"{component_id}.page_current"]
+    return [output]
+
+
+callback_outputs = [key for output in dispatch_outputs for key in paged_keys(output)]
+
+
+def paged_outputs(outputs):
+    for table, dimension in paged_tables.items():
+        records = outputs.pop(f"{table}.data")
+        if records is no_update:
+            outputs[f"{table}-rows.data"] = outputs[f"{table}.page_current"] = no_update
+            continue
+        data = dataset()
+        unfiltered = len(records) == len(data.sort_keys[dimension][dimension])
+        outputs[f"{table}-rows.data"] = None if unfiltered else [data.row_positions[dimension][record[dimension]] for record in records]
+        outputs[f"{table}.page_current"] = 0
+    return outputs
+
+
+# COALESCING: when the User clicks through rows faster than the server responds, only the last click's response is shown. Every
+# page view sends its random id (the "page-view" store, set by assets/coalesce.js) with the crossfilter requests; a click starts a
+# new generation of its page view, and the requests of the older generations still in progress stop at their next check
+# (check_superseded: before every handler and figure) with an empty response. The chained requests (cleared active cells) do not
+# start a generation, so that they never supersede a click. While a request runs, the page shows a busy cursor ("running").
+# The generations are shared by the worker processes forked from the process that imported the app (gunicorn.conf.py preloads
+# it), so that a click answered by one worker supersedes the requests of its page view running on the others. Workers that
+# import the app themselves (no preload) have their own generations: set CV_COALESCE=0 there, or route a page view to one worker.
+COALESCE = os.environ.get("CV_COALESCE", "1") == "1" and not CLIENTSIDE_MODE
+
+
+def crossfilter_dispatch(*values):
+    if COALESCE:
+        *values, page_view = values
+        if page_view is not None and ctx.triggered[0]["value"] is not None:
+            g.generation = (page_view, request_generations.start(page_view))
+    values = dict(zip(dispatch_triggers + dispatch_states, values))
+    outputs = dict.fromkeys(dispatch_outputs, no_update)
+
+    g.callback_trigger = ctx.triggered_id # for the response size metrics
+    callback_metrics.count_trigger(ctx.triggered_id)
+    for handler, handler_outputs, handler_inputs in dispatch_routes[ctx.triggered_id]:
+        check_superseded()
+        started = time.perf_counter()
+        try:
+            result = handler(*[values[key] for key in handler_inputs])
+        except Superseded:
+            raise
+        except PreventUpdate:
+            callback_metrics.count_prevented(handler.__name__)
+            continue
+        finally:
+            callback_metrics.observe_latency(handler.__name__, time.perf_counter() - started)
+        outputs.update(zip(handler_outputs, result))
+
+    if all(value is no_update for value in outputs.values()):
+        raise PreventUpdate
+    check_superseded()
+    outputs = paged_outputs(outputs)
+    return [outputs[key] for key in callback_outputs]
+
+
+# ASYNC (CV_ASYNC=1): the dispatcher is a coroutine, and the Gantt / word cloud figures of a click are built concurrently in a
+# bounded thread pool while the handlers compute the tables and styles (see deferred). A pool thread runs with a copy of the
+# request context and the request's data snapshot and generation, so that it reads the same data as the rest of the response
+# and stops as well when the click is superseded. Back-pressure: at most CV_ASYNC_WORKERS + CV_ASYNC_QUEUE figure builds are
+# in the pool; a request waits up to CV_ASYNC_QUEUE_TIMEOUT seconds for a free slot, then gets "503 Service Unavailable".
+ASYNC_WORKERS = int(os.environ.get("CV_ASYNC_WORKERS", min(4, os.cpu_count() or 1)))
+ASYNC_QUEUE = int(os.environ.get("CV_ASYNC_QUEUE", 4 * ASYNC_WORKERS))
+ASYNC_QUEUE_TIMEOUT = float(os.environ.get("CV_ASYNC_QUEUE_TIMEOUT", 10))
+figure_pool = ThreadPoolExecutor(max_workers=ASYNC_WORKERS, thread_name_prefix="figures") if ASYNC_MODE else None
+figure_pool_slots = threading.BoundedSemaphore(ASYNC_WORKERS + ASYNC_QUEUE)
+
+
+def submit_figure(build, **selection):
+    if not figure_pool_slots.acquire(timeout=ASYNC_QUEUE_TIMEOUT):
+        logger.warning(f"figure pool full ({ASYNC_WORKERS} workers + {ASYNC_QUEUE} queued) for {ASYNC_QUEUE_TIMEOUT} s, rejecting the request")
+        abort(503)
+    data, generation, trigger = dataset(), g.get("generation"), g.get("callback_trigger")
+
+    @copy_current_request_context
+    def build_in_pool():
+        g.dataset, g.generation, g.callback_trigger = data, generation, trigger # a copied request context has a new g
+        started = time.perf_counter()
+        try:
+            return build(**selection)
+        finally:
+            callback_metrics.observe_latency(build.__name__, time.perf_counter() - started)
+
+    future = figure_pool.submit(build_in_pool)
+    future.add_done_callback(lambda _: figure_pool_slots.release())
+    return future
+
+
+async def crossfilter_dispatch_async(*values):
+    g.defer_figures = True
+    outputs = crossfilter_dispatch(*values)
+    pending = [index for index, value in enumerate(outputs) if isinstance(value, Future)]
+    for index, figure in zip(pending, await asyncio.gather(*[asyncio.wrap_future(outputs[index]) for index in pending])):
+        outputs[index] = figure
+    return outputs
+
+
+def dependencies(dependency_class, keys):
+    return [dependency_class(*key.split(".")) for key in keys]
+
+
+crossfilter_dispatch_dependencies = (
+    *dependencies(Output, callback_outputs),
+    *dependencies(Input, dispatch_triggers),
+    *dependencies(State, dispatch_states),
+)
+if CLIENTSIDE_MODE: # the same routing, evaluated by the namesakes of the handlers in assets/crossfilter.js
+    dispatch_routing = {
+        "outputs": dispatch_outputs,
+        "inputs": dispatch_triggers + dispatch_states,
+        "routes": {trigger: [[handler.__name__, outputs, inputs] for handler, outputs, inputs in routes] for trigger, routes in dispatch_routes.items()},
+    }
+    app.clientside_callback(
+        f"(...values) => window.dash_clientside.crossfilter.dispatch({json.dumps(dispatch_routing)}, ...values)",
+        *crossfilter_dispatch_dependencies,
+        State("crossfilter-store", "data"),
+        prevent_initial_call=True
+    )
+else:
+    app.callback(
+        *crossfilter_dispatch_dependencies,
+        *([State("page-view", "data")] if COALESCE else []),
+        running=[(Output("background", "className"), "busy", "")],
+        prevent_initial_call=True
+    )(crossfilter_dispatch_async if ASYNC_MODE else crossfilter_dispatch)
+
+
+#__________________________________________________
+# PAGING: the rows of the current page of the Achievements / Tasks tables (paging mode only)
+#__________________________________________________
+
+
+def table_page_callback(table, dimension):
+    def page(rows, page_current, page_size, sort_by):
+        g.callback_trigger = table # for the response size metrics
+        callback_metrics.count_trigger(table)
+        started = time.perf_counter()
+        try:
+            return table_page(dimension, rows, page_current, page_size, sort_by)
+        finally:
+            callback_metrics.observe_latency(f"{table}_page", time.perf_counter() - started)
+
+    app.callback(
+        Output(table, "data"),
+        Output(table, "page_count"),
+        Input(f"{table}-rows", "data"),
+        Input(table, "page_current"),
+        Input(table, "page_size"),
+        Input(table, "sort_by"),
+        prevent_initial_call=True
+    )(page)
+
+
+for table, dimension in paged_tables.items():
+    table_page_callback(table, dimension)
+
+
+#########################################################################################################################################################
+################################################################### SELECTION STATES ####################################################################
+#########################################################################################################################################################
+
+
+# output builders of the update callbacks: (selected value, active cell row) -> outputs tuple
+output_builders = {
+    "projects": projects_table_outputs,
+    "roles": roles_table_outputs,
+    "word_cloud": word_cloud_outputs,
+    "tasks": tasks_outputs,
+    "achievements": achievements_outputs,
+    "background": background_outputs,
+}
+
+
+def selection_states():
+    # every selection the User can make on the unfiltered views (+ the reset state): (source, selected value, active cell row)
+    data = dataset()
+    yield "background", None, None
+    for row, client_order in enumerate(data.df_clients["Client_Order"].tolist()):
+        yield "projects", client_order, row
+    for role in data.df_roles["Role"].tolist():
+        yield "roles", role, None
+    for tool in data.df_tools["Tool"].tolist():
+        yield "word_cloud", tool, None
+    for row, task in enumerate(data.df_tasks["Task"].tolist()):
+        yield "tasks", task, row
+    for row, achievement in enumerate(data.df_achievements["Achievement"].tolist()):
+        yield "achievements", achievement, row
+
+
+def selection_outputs(source, selected_value=None, active_cell_row=None):
+    key = (source, selected_value, active_cell_row)
+    precomputed_outputs = dataset().precomputed_outputs
+    if key in precomputed_outputs:
+        return precomputed_outputs[key]
+    return output_builders[source](selected_value, active_cell_row) # e.g. a row of a filtered Tasks/Achievements table
+
+
+# Precompute mode: render the outputs of every selection state once and share them between processes via a disk snapshot
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_path(version):
+    outputs_kind = ("patch" if PATCH_MODE else "full") + ("-merged" if MERGED_BANDS else "") + ("-compact" if COMPACT_HIGHLIGHT else "")
+    return os.path.join(os.environ.get("CV_SNAPSHOT_DIR", "cache"), f"selection-states-v{SNAPSHOT_VERSION}-{outputs_kind}-{version[:16]}.pkl")
+
+
+def load_snapshot(path, version):
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("data_hash") != version:
+        return None
+    return snapshot["outputs"]
+
+
+def write_snapshot(path, outputs, version):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump({"version": SNAPSHOT_VERSION, "data_hash": version, "outputs": outputs}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path) # atomic, so concurrently starting workers never read a partial snapshot
+
+
+def precompute():
+    data = dataset()
+    path = snapshot_path(data.version)
+    outputs = load_snapshot(path, data.version)
+    if outputs is None:
+        outputs = {(source, value, row): output_builders[source](value, row) for source, value, row in selection_states()}
+        write_snapshot(path, outputs, data.version)
+    data.precomputed_outputs.update(outputs)
+
+
+if os.environ.get("CV_PRECOMPUTE") == "1":
+    precompute()
+
+
+#########################################################################################################################################################
+###################################################################### DATA RELOAD ######################################################################
+#########################################################################################################################################################
+
+
+# Hot reload: a background thread watches data/*.csv; on a change, a new Dataset is built and validated off to the side, and
+# then swapped in with one assignment. Requests in flight finish on the snapshot they started with.
+RELOAD_INTERVAL = float(os.environ.get("CV_RELOAD_INTERVAL", 0)) # seconds between checks for changes, 0 disables the watcher
+
+reload_lock = threading.Lock()
+
+
+def validate_dataset(data):
+    if data_hash() != data.version:
+        raise ValueError("data/*.csv changed while loading")
+    for name in ["df_clients", "df_gantt", "df_roles", "df_achievements", "df_tasks", "df_tools"]:
+        if getattr(data, name).empty:
+            raise ValueError(f"{name} is empty")
+    if data.df_clients["Client_Order"].duplicated().any():
+        raise ValueError("Client_Order is not unique per client")
+    # the tools of data.csv first: a tool with two Tool_Type / Tool_Size values would also show up below as two word cloud rows
+    df_tool_rows = decoded(data.df[["Tool", "Tool_Type", "Tool_Size"]].drop_duplicates())
+    for column in ["Tool_Type", "Tool_Size"]:
+        values = df_tool_rows.groupby("Tool")[column].unique()
+        inconsistent = values[values.str.len() > 1]
+        if not inconsistent.empty:
+            raise ValueError(f"tool {inconsistent.index[0]!r} has more than one {column} in data/data.csv: {sorted(map(str, inconsistent.iloc[0]))}")
+    unknown = df_tool_rows[~df_tool_rows["Tool_Type"].isin(tool_type_colors)]
+    if not unknown.empty:
+        raise ValueError(f"tool {unknown['Tool'].iloc[0]!r} has an unknown Tool_Type {unknown['Tool_Type'].iloc[0]!r} in data/data.csv, expected one of {sorted(tool_type_colors)}")
+    duplicated = data.df_tools.loc[data.df_tools["Tool"].duplicated(), "Tool"]
+    if not duplicated.empty:
+        raise ValueError(f"tool {duplicated.iloc[0]!r} has more than one word cloud position in data/word_cloud_coordinates.csv")
+
+    # render everything the app serves from the new snapshot: the layout and the outputs of every selection state (the figures
+    # without the live figure cache, which would otherwise be flushed by figures that may never be served)
+    with using(data):
+        data.rendered["layout"] = build_layout()
+        outputs = {(source, value, row): output_builders[source](value, row) for source, value, row in selection_states()}
+        if os.environ.get("CV_PRECOMPUTE") == "1":
+            write_snapshot(snapshot_path(data.version), outputs, data.version)
+            data.precomputed_outputs.update(outputs)
+
+
+def reload_data():
+    """Rebuild the Dataset from data/*.csv and swap it in if it validates. Returns True if the data was swapped."""
+    global current_dataset
+    with reload_lock:
+        previous = current_dataset
+        if data_hash() == previous.version:
+            return False
+        try:
+            data = load_dataset()
+            validate_dataset(data)
+        except Exception:
+            logger.exception(f"data reload failed, keeping data version {previous.version[:16]}")
+            return False
+
+        current_dataset = data
+        figure_cache.invalidate(keep_version=data.version) # the figures of the previous snapshots
+        logger.info(f"data reloaded: version {previous.version[:16]} -> {data.version[:16]}", extra={"sampled": False})
+        return True
+
+
+def data_signature():
+    return [(path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in sorted(glob.glob("data/*.csv"))]
+
+
+def watch_data(interval):
+    loaded = previous = data_signature()
+    while True:
+        time.sleep(interval)
+        try:
+            signature = data_signature()
+        except OSError: # a file replaced right between glob and stat
+            continue
+        if signature == previous and signature != loaded: # changed, and unchanged since the last check, i.e. fully written
+            reload_data()
+            loaded = signature
+        previous = signature
+
+
+def start_data_watcher():
+    if RELOAD_INTERVAL > 0:
+        threading.Thread(target=watch_data, args=(RELOAD_INTERVAL,), name="data-watcher", daemon=True).start()
+
+
+start_data_watcher()
+
+
+server = app.server # WSGI entry point, e.g. gunicorn -c gunicorn.conf.py app:server
+
+
+if __name__ == "__main__":
+    app.run(debug=os.environ.get("CV_DEBUG") == "1")
@@ -0,0 +1,17 @@
+// Request coalescing: sets the random id of this page view in the "page-view" store before the first click, so that app.py can
+// tell a newer click of the same page view from those of other page views, and stop the requests it supersedes (see COALESCING).
+
+
+const pageView = window.crypto && window.crypto.randomUUID ? window.crypto.randomUUID() : `${Date.now()}-${Math.random()}`;
+let pageViewRecorded = false;
+
+
+function recordPageView() {
+    if (!pageViewRecorded && window.dash_clientside && window.dash_clientside.set_props) {
+        window.dash_clientside.set_props("page-view", {data: pageView});
+        pageViewRecorded = true;
+    }
+}
+
+
+document.addEventListener("mousedown", recordPageView, true);
@@ -0,0 +1,294 @@
+// Client-side crossfilter mode (CV_CLIENTSIDE=1): the same callback handlers as in app.py, evaluated in the browser
+// against the relation maps and style templates shipped once in the "crossfilter-store" dcc.Store.
+
+
+function related(store, dimension, value, relatedDimension) {
+    const relations = store.relations[dimension][String(value)];
+    return (relations && relations[relatedDimension]) || [];
+}
+
+
+function highlightRules(column, values) {
+    return values.map(value => ({"if": {"filter_query": `{${column}} = "${value}"`}, "backgroundColor": "lightblue"}));
+}
+
+
+function rowRule(row) {
+    return [{"if": {"row_index": row}, "backgroundColor": "lightblue"}];
+}
+
+
+function records(column, values) {
+    return values.map(value => ({[column]: value}));
+}
+
+
+function composite(fills) {
+    // mirrors composite in app.py: "over" alpha compositing of the rgba fills stacked on a row (bottom first)
+    let [red, green, blue, alpha] = [0, 0, 0, 0];
+    fills.forEach(fill => {
+        const [r, g, b, opacity] = fill.slice(fill.indexOf("(") + 1, -1).split(",").map(Number);
+        const composited = opacity + alpha * (1 - opacity);
+        [red, green, blue] = [[r, red], [g, green], [b, blue]].map(([channel, below]) => (
+            (channel * opacity + below * alpha * (1 - opacity)) / composited
+        ));
+        alpha = composited;
+    });
+    return `rgba(${red}, ${green}, ${blue}, ${alpha})`;
+}
+
+
+function mergedRowShapes(shapes) {
+    // mirrors merged_row_shapes in app.py (CV_GANTT_BANDS=merged): one path shape per row color, a rectangle per run of rows
+    const stacked = new Map();
+    shapes.forEach(shape => {
+        const row = shape.y0 + 0.5;
+        stacked.set(row, (stacked.get(row) || []).concat([shape.fillcolor]));
+    });
+    const runs = new Map();
+    Array.from(stacked.keys()).sort((a, b) => a - b).forEach(row => {
+        const fill = composite(stacked.get(row));
+        const fillRuns = runs.get(fill) || [];
+        if (fillRuns.length && fillRuns[fillRuns.length - 1][1] === row - 1) {
+            fillRuns[fillRuns.length - 1][1] = row;
+        } else {
+            fillRuns.push([row, row]);
+        }
+        runs.set(fill, fillRuns);
+    });
+    return Array.from(runs, ([fill, fillRuns]) => ({
+        "type": "path", "xref": "paper", "yref": "y",
+        "path": fillRuns.map(([first, last]) => `M0,${first - 0.5}H1V${last + 0.5}H0Z`).join(""),
+        "fillcolor": fill, "layer": "below", "line": {"width": 0}
+    }));
+}
+
+
+function createGantt(store, dimension = null, value = null) {
+    const gantt = store.gantt;
+    if (dimension === null) {
+        return gantt.figure;
+    }
+
+    // apply darker gray color to the highlighted Gantt bars
+    const highlighted = new Set(dimension === "Client_Order" ? [value] : related(store, dimension, value, "Client_Order"));
+    const bars = gantt.bars;
+    const template = gantt.figure.data[0];
+    const traces = [];
+    const tracesByColor = {};
+    bars.client_order.forEach((clientOrder, i) => {
+        const color = highlighted.has(clientOrder) ? "dimgray" : bars.color[i];
+        if (!(color in tracesByColor)) { // one trace per color, in the order of first appearance (as px.timeline does)
+            tracesByColor[color] = Object.assign({}, template, {
+                base: [], x: [], y: [], text: [], marker: Object.assign({}, template.marker, {color: color})
+            });
+            traces.push(tracesByColor[color]);
+        }
+        const trace = tracesByColor[color];
+        trace.base.push(bars.base[i]);
+        trace.x.push(bars.x[i]);
+        trace.y.push(bars.y[i]);
+        trace.text.push(bars.text[i]);
+    });
+
+    const shape = (i, fillcolor) => ({
+        "type": "rect", "xref": "paper", "yref": "y", "x0": 0, "x1": 1, "y0": i - 0.5, "y1": i + 0.5,
+        "fillcolor": fillcolor, "layer": "below", "line": {"width": 0}
+    });
+    const highlight = "rgba(173, 216, 230, 1)";
+    const banding = "rgba(240, 240, 240, 0.5)";
+    const selectedClientRow = dimension === "Client_Order" ? gantt.clients_orders_list.indexOf(value) : null;
+    const shapes = [];
+    for (let i = 0; i < gantt.clients_list_length; i++) {
+        if (selectedClientRow !== null && i === gantt.clients_list_length - selectedClientRow - 1) {
+            shapes.push(shape(i, highlight));
+        } else if (i % 2 === 0) {
+            shapes.push(shape(i, banding));
+        }
+        if (dimension !== "Client_Order") {
+            if (highlighted.has(gantt.all_clients_orders[i])) {
+                shapes.push(shape(i, highlight));
+            } else if (i % 2 === 0) {
+                shapes.push(shape(i, banding));
+            }
+        }
+    }
+
+    return Object.assign({}, gantt.figure, {data: traces, layout: Object.assign({}, gantt.figure.layout, {
+        shapes: gantt.merged_bands ? mergedRowShapes(shapes) : shapes
+    })});
+}
+
+
+function createWordcloud(store, dimension = null, value = null) {
+    const wordCloud = store.word_cloud;
+    if (dimension === null) {
+        return wordCloud.figure;
+    }
+
+    // dim colors for the unrelated items
+    const relatedTools = new Set(dimension === "Tool" ? [value] : related(store, dimension, value, "Tool"));
+    const color = wordCloud.tools.map((tool, i) => (
+        relatedTools.has(tool) ? store.tool_type_colors : store.tool_type_colors_2
+    )[wordCloud.tool_types[i]]);
+    const size = wordCloud.font_sizes.map((fontSize, i) => (
+        dimension === "Tool" && wordCloud.tools[i] === value ? fontSize + 2 : fontSize
+    ));
+
+    const trace = wordCloud.figure.data[0];
+    return Object.assign({}, wordCloud.figure, {
+        data: [Object.assign({}, trace, {textfont: Object.assign({}, trace.textfont, {color: color, size: size})})]
+    });
+}
+
+
+function singleSelection(dimension, value) {
+    // compound (multi-)selections are evaluated on the server only: here every click selects the clicked item alone
+    return {"operator": null, "items": [[dimension, value]]};
+}
+
+
+function deactivate(trigger, outputsCount) {
+    if (trigger === null || trigger === undefined) { // if triggered by a chained callback instead, do not update the callback output(s)
+        throw window.dash_clientside.PreventUpdate;
+    }
+    return Array.from({length: outputsCount}, (_, i) => (i % 2 === 0 ? null : []));
+}
+
+
+function dispatch(routing, ...values) {
+    // mirrors crossfilter_dispatch in app.py: routes the click to the handlers of the clicked element, one response for all outputs
+    const store = values.pop();
+    const valuesByKey = Object.fromEntries(routing.inputs.map((key, i) => [key, values[i]]));
+    const context = window.dash_clientside.callback_context;
+    const trigger = context.triggered_id || context.triggered[0].prop_id.split(".")[0];
+    const outputs = Object.fromEntries(routing.outputs.map(key => [key, window.dash_clientside.no_update]));
+
+    let updated = false;
+    for (const [handler, handlerOutputs, handlerInputs] of routing.routes[trigger]) {
+        let result;
+        try {
+            result = window.dash_clientside.crossfilter[handler](...handlerInputs.map(key => valuesByKey[key]), store);
+        } catch (error) {
+            if (error === window.dash_clientside.PreventUpdate) {
+                continue;
+            }
+            throw error;
+        }
+        handlerOutputs.forEach((key, i) => { outputs[key] = result[i]; });
+        updated = true;
+    }
+
+    if (!updated) {
+        throw window.dash_clientside.PreventUpdate;
+    }
+    return routing.outputs.map(key => outputs[key]);
+}
+
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    crossfilter: {
+        dispatch: dispatch,
+
+        projects_table_deactivate: (active_cell, store) => deactivate(active_cell, 6),
+        roles_table_deactivate: (active_cell, store) => deactivate(active_cell, 6),
+        word_cloud_deactivate: (clickData, store) => deactivate(clickData, 8),
+        tasks_deactivate: (active_cell, store) => deactivate(active_cell, 6),
+        achievements_deactivate: (active_cell, store) => deactivate(active_cell, 6),
+        background_deactivate: (n_clicks, store) => deactivate(n_clicks, 8),
+
+        projects_table_update: function (active_cell, data, modifier, selection, store) {
+            if (!active_cell) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            const clientOrder = data[active_cell.row]["Client_Order"];
+            return [
+                createGantt(store, "Client_Order", clientOrder),
+                store.clients_style.concat(rowRule(active_cell.row)),
+                store.roles_style.concat(highlightRules("Role", related(store, "Client_Order", clientOrder, "Role"))),
+                records("Achievement", related(store, "Client_Order", clientOrder, "Achievement")),
+                records("Task", related(store, "Client_Order", clientOrder, "Task")),
+                createWordcloud(store, "Client_Order", clientOrder),
+                singleSelection("Client_Order", clientOrder),
+            ];
+        },
+
+        roles_table_update: function (active_cell, data, modifier, selection, store) {
+            if (!active_cell) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            const role = data[active_cell.row]["Role"];
+            return [
+                createGantt(store, "Role", role),
+                store.clients_style.concat(highlightRules("Client_Order", related(store, "Role", role, "Client_Order"))),
+                store.roles_style.concat(highlightRules("Role", [role])),
+                records("Achievement", related(store, "Role", role, "Achievement")),
+                records("Task", related(store, "Role", role, "Task")),
+                createWordcloud(store, "Role", role),
+                singleSelection("Role", role),
+            ];
+        },
+
+        word_cloud_update: function (clickData, modifier, selection, store) {
+            if (!clickData) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            const tool = clickData.points[0].text;
+            return [
+                createGantt(store, "Tool", tool),
+                store.clients_style.concat(highlightRules("Client_Order", related(store, "Tool", tool, "Client_Order"))),
+                store.roles_style.concat(highlightRules("Role", related(store, "Tool", tool, "Role"))),
+                records("Achievement", related(store, "Tool", tool, "Achievement")),
+                records("Task", related(store, "Tool", tool, "Task")),
+                createWordcloud(store, "Tool", tool),
+                singleSelection("Tool", tool),
+            ];
+        },
+
+        tasks_update: function (active_cell, data, modifier, selection, store) {
+            if (!active_cell) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            const task = data[active_cell.row]["Task"];
+            return [
+                createGantt(store, "Task", task),
+                store.clients_style.concat(highlightRules("Client_Order", related(store, "Task", task, "Client_Order"))),
+                store.roles_style.concat(highlightRules("Role", related(store, "Task", task, "Role"))),
+                records("Achievement", related(store, "Task", task, "Achievement")),
+                store.clients_style.concat(rowRule(active_cell.row)),
+                createWordcloud(store, "Task", task),
+                singleSelection("Task", task),
+            ];
+        },
+
+        achievements_update: function (active_cell, data, modifier, selection, store) {
+            if (!active_cell) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            const achievement = data[active_cell.row]["Achievement"];
+            return [
+                createGantt(store, "Achievement", achievement),
+                store.clients_style.concat(highlightRules("Client_Order", related(store, "Achievement", achievement, "Client_Order"))),
+                store.roles_style.concat(highlightRules("Role", related(store, "Achievement", achievement, "Role"))),
+                store.clients_style.concat(rowRule(active_cell.row)),
+                records("Task", related(store, "Achievement", achievement, "Task")),
+                createWordcloud(store, "Achievement", achievement),
+                singleSelection("Achievement", achievement),
+            ];
+        },
+
+        background_update: function (n_clicks, store) {
+            return [
+                createGantt(store),
+                store.clients_style,
+                store.roles_style,
+                store.achievements,
+                store.clients_style,
+                store.tasks,
+                store.clients_style,
+                createWordcloud(store),
+                null,
+            ];
+        },
+    }
+});
@@ -0,0 +1,28 @@
+// Multi-selection: records the modifier key of every click in the "selection-modifier" store, which the update callbacks in app.py
+// read to combine the clicked item with the current selection (Ctrl/Cmd-click: intersection, Shift-click: union).
+
+
+function recordModifier(event) {
+    const modifier = event.ctrlKey || event.metaKey ? "and" : event.shiftKey ? "or" : null;
+    if (window.dash_clientside && window.dash_clientside.set_props) {
+        window.dash_clientside.set_props("selection-modifier", {data: modifier});
+    }
+}
+
+
+function unshiftedTableClick(event) {
+    // a Shift-click on a DataTable cell would extend the table's cell range instead of changing its active_cell: once the
+    // modifier is recorded, the click is passed on to the table without Shift
+    const cell = event.target.closest && event.target.closest(".dash-spreadsheet td");
+    if (!event.shiftKey || !event.isTrusted || !cell) {
+        return;
+    }
+    event.stopPropagation();
+    event.target.dispatchEvent(new MouseEvent("click", {
+        bubbles: true, cancelable: true, view: window, clientX: event.clientX, clientY: event.clientY, button: event.button
+    }));
+}
+
+
+document.addEventListener("mousedown", recordModifier, true);
+document.addEventListener("click", unshiftedTableClick, true);
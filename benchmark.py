@@ -0,0 +1,190 @@
+"""Benchmark of the app's callbacks and figure builders over every selection state in the real data.
+
+    python benchmark.py                                  # print the results
+    python benchmark.py --save-baseline baseline.json    # ... and save them as the baseline
+    python benchmark.py --baseline baseline.json         # ... and fail (exit code 1) on regressions
+
+Reports p50/p95/p99 latency, peak allocations and serialized response bytes per function, plus the import time of app.py.
+The *_express rows build the same figures with plotly.express (CV_PLOTLY_EXPRESS=1), for comparison.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.chdir(os.path.dirname(os.path.abspath(__file__))) # app.py reads data/*.csv relative to the working directory
+os.environ.setdefault("CV_LOG_SAMPLE_RATE", "0")
+
+import app # noqa: E402
+from plotly.io.json import to_json_plotly # noqa: E402
+
+
+def records(df):
+    return json.loads(to_json_plotly(df.to_dict("records"))) # as sent by the browser
+
+
+def cases():
+    # function name -> (function, [args of every selection state])
+    data = app.dataset()
+    clicks = {
+        "projects_table_update": (app.projects_table_update, data.df_clients),
+        "roles_table_update": (app.roles_table_update, data.df_roles),
+        "tasks_update": (app.tasks_update, data.df_tasks),
+        "achievements_update": (app.achievements_update, data.df_achievements),
+    }
+    benchmarked = {}
+    for name, (function, df) in clicks.items():
+        table = records(df)
+        benchmarked[name] = (function, [({"row": row, "column": 0}, table, None, None) for row in range(len(table))])
+    benchmarked["word_cloud_update"] = (app.word_cloud_update, [({"points": [{"text": tool}]}, None, None) for tool in data.df_tools["Tool"]])
+
+    # compound selections: a Ctrl/Shift-click on every tool while a role is selected (intersection / union)
+    benchmarked["compound_update"] = (app.word_cloud_update, [
+        ({"points": [{"text": tool}]}, operator, {"operator": None, "items": [["Role", role]]})
+        for operator in ("and", "or")
+        for role in data.df_roles["Role"].head(3)
+        for tool in data.df_tools["Tool"]
+    ])
+    benchmarked["background_update"] = (app.background_update, [(1,)])
+
+    # the figure builders themselves, bypassing the figure cache
+    selections = [{}] + [
+        {argument: value}
+        for argument, values in [
+            ("selected_client_order", data.clients_orders_list),
+            ("selected_role", data.df_roles["Role"]),
+            ("selected_tool", data.df_tools["Tool"]),
+            ("selected_task", data.df_tasks["Task"]),
+            ("selected_achievement", data.df_achievements["Achievement"].dropna()),
+        ]
+        for value in values
+    ]
+    benchmarked["create_gantt"] = (lambda **selection: app.create_gantt.__wrapped__(**selection), selections)
+    benchmarked["create_wordcloud"] = (lambda **selection: app.create_wordcloud.__wrapped__(**selection), selections)
+
+    # the same figures built with plotly.express (CV_PLOTLY_EXPRESS=1), for comparison with the dict-based builders above
+    benchmarked["create_gantt_express"] = (
+        lambda **selection: app.gantt_figure_express(*app.gantt_highlighting(*app.selection_of(**selection))), selections
+    )
+    benchmarked["create_wordcloud_express"] = (
+        lambda **selection: app.wordcloud_figure_express(*app.wordcloud_highlighting(*app.selection_of(**selection))), selections
+    )
+    return benchmarked
+
+
+def call(function, args):
+    return function(**args) if isinstance(args, dict) else function(*args)
+
+
+def percentile(samples, q):
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1] if len(samples) > 1 else samples[0]
+
+
+def benchmark_function(function, states, repeat, warm):
+    timings = []
+    for _ in range(repeat):
+        for args in states:
+            if not warm:
+                app.figure_cache.invalidate()
+            started = time.perf_counter()
+            call(function, args)
+            timings.append(time.perf_counter() - started)
+
+    # separate pass, as tracing slows the calls down
+    peaks = []
+    sizes = []
+    for args in states:
+        if not warm:
+            app.figure_cache.invalidate()
+        tracemalloc.start()
+        result = call(function, args)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        sizes.append(len(to_json_plotly(result)))
+
+    return {
+        "samples": len(timings),
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "alloc_peak_kb": statistics.mean(peaks) / 1024,
+        "response_bytes": statistics.mean(sizes),
+    }
+
+
+def benchmark_import(repeat, env=None):
+    code = "import time; started = time.perf_counter(); import app; print(time.perf_counter() - started)"
+    timings = [
+        float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env={**os.environ, **(env or {})}).stdout.split()[-1])
+        for _ in range(repeat)
+    ]
+    return {
+        "samples": len(timings),
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+    }
+
+
+def regressions(results, baseline, metrics, threshold):
+    found = []
+    for name, result in results.items():
+        for metric in metrics:
+            if metric in result and metric in baseline.get(name, {}):
+                before, after = baseline[name][metric], result[metric]
+                if after > before * (1 + threshold):
+                    found.append(f"{name}.{metric}: {before:.2f} -> {after:.2f} (+{(after / before - 1) * 100 if before else float('inf'):.0f}%)")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="passes over all selection states per function (default 3)")
+    parser.add_argument("--import-repeat", type=int, default=5, help="app.py imports in fresh interpreters (default 5)")
+    parser.add_argument("--warm", action="store_true", help="keep the figure cache between calls (default: cold cache on every call)")
+    parser.add_argument("--only", nargs="*", help="benchmark only these functions ('import' / 'import_express' for the import time)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="save the results as a baseline JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a baseline JSON and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative increase over the baseline (default 0.2 = 20%%)")
+    parser.add_argument("--metrics", nargs="*", default=["p95_ms", "alloc_peak_kb", "response_bytes"], help="metrics compared against the baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (function, states) in cases().items():
+        if args.only is None or name in args.only:
+            results[name] = benchmark_function(function, states, args.repeat, args.warm)
+    if args.only is None or "import" in args.only:
+        results["import"] = benchmark_import(args.import_repeat)
+    if args.only is None or "import_express" in args.only:
+        results["import_express"] = benchmark_import(args.import_repeat, {"CV_PLOTLY_EXPRESS": "1"})
+
+    print(f"{'function':<24}{'samples':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'alloc KB':>11}{'bytes':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<24}{result['samples']:>8}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+            f"{result.get('alloc_peak_kb', float('nan')):>11.1f}{result.get('response_bytes', float('nan')):>10.0f}"
+        )
+
+    if args.save_baseline:
+        meta = {"python": platform.python_version(), "platform": platform.platform(), "warm": args.warm, "repeat": args.repeat}
+        with open(args.save_baseline, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        found = regressions(results, baseline, args.metrics, args.threshold)
+        for regression in found:
+            print(f"REGRESSION {regression}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
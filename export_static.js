@@ -0,0 +1,51 @@
+// Static export (export_static.py): the crossfilter callback of app.py, replaced by the responses recorded for every selection
+// state (states/*.json), so that the bundle is served without the Dash server.
+
+
+const recordedStates = fetch("states/index.json").then(response => response.json());
+
+
+function stateKey(columns, trigger, values) {
+    // [trigger, row, value] of the click, as the keys written by export_static.py; null for a chained (cleared) trigger
+    if (trigger === "background") {
+        return [trigger, null, null];
+    }
+    if (trigger === "word-cloud") {
+        const clickData = values["word-cloud.clickData"];
+        return clickData ? [trigger, null, clickData.points[0].text] : null;
+    }
+    const activeCell = values[`${trigger}.active_cell`];
+    if (!activeCell) {
+        return null;
+    }
+    const record = values[`${trigger}.data`][activeCell.row];
+    const value = record[columns[trigger]];
+    return [trigger, activeCell.row, value === undefined ? null : value];
+}
+
+
+async function dispatch(...values) {
+    const context = window.dash_clientside.callback_context; // read before the first await: it is reset after the call returns
+    const trigger = context.triggered_id || context.triggered[0].prop_id.split(".")[0];
+    const valuesByKey = Object.assign({}, context.inputs, context.states);
+    const outputs = context.outputs_list;
+
+    const index = await recordedStates;
+    const key = stateKey(index.columns, trigger, valuesByKey);
+    const state = key === null ? null : index.states[JSON.stringify(key)];
+    if (state === null || state === undefined) { // nothing to update, as the server's PreventUpdate
+        throw window.dash_clientside.PreventUpdate;
+    }
+
+    const response = await (await fetch(`states/${state}.json`)).json();
+    return outputs.map(({id, property}) => (
+        id in response && property in response[id] ? response[id][property] : window.dash_clientside.no_update
+    ));
+}
+
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    static_export: {
+        dispatch: dispatch,
+    }
+});
@@ -0,0 +1,187 @@
+"""Static export: renders the page, the layout and the callback response of every selection state into a bundle that any
+static file host or CDN can serve, without the Dash server.
+
+    python export_static.py build/static        # then e.g. python -m http.server -d build/static
+
+The bundle has the Dash page and scripts, the assets and content-hashed static files, the layout and one JSON file per
+selection state (states/*.json).
+Everything is recorded from the live app through its test client, so the bundle shows exactly what the app returns.
+The crossfilter callback is replaced by a client-side dispatcher (export_static.js), which fetches the recorded response of the
+clicked state instead of calling the server. The selection states are every click the User can reach from the initial page:
+the rows of the Projects / Roles tables, the word cloud tools, the background, and the rows of every (filtered) Achievements /
+Tasks table the other clicks show. Ctrl / Shift-clicks are plain clicks in the bundle (compound selections are not recorded).
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import urllib.parse
+from collections import deque
+
+os.chdir(os.path.dirname(os.path.abspath(__file__))) # app.py reads data/*.csv relative to the working directory
+os.environ.setdefault("CV_LOG_SAMPLE_RATE", "0")
+for name in ("CV_CLIENTSIDE", "CV_PATCH", "CV_COMPACT_HIGHLIGHT", "CV_TABLE_PAGE_SIZE", "CV_RELOAD_INTERVAL"): # full responses of the server callbacks only
+    os.environ.pop(name, None)
+
+import app # noqa: E402
+
+
+# the column of the clicked row that the update callbacks read, per table (as in export_static.js)
+table_columns = {
+    "projects-table": "Client_Order",
+    "roles-table": "Role",
+    "tasks-table": "Task",
+    "achievements-table": "Achievement",
+}
+
+
+def write(bundle, path, body):
+    path = os.path.join(bundle, urllib.parse.unquote(path.split("?")[0].lstrip("/")))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+def fetch(client, url):
+    response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {url}: {response.status_code}")
+    return response.data
+
+
+def layout_props(layout):
+    # component id -> props of the components in the layout JSON
+    found = {}
+    stack = [layout]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if "props" in node and "id" in node["props"]:
+                found[node["props"]["id"]] = node["props"]
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return found
+
+
+def export_page(client, bundle):
+    # index.html with relative URLs (so that the bundle can be served from any path), plus the files it references
+    page = fetch(client, "/").decode("utf-8")
+    for url in re.findall(r'(?:src|href)="(/[^"]+)"', page):
+        write(bundle, url, fetch(client, url))
+    page = page.replace('"requests_pathname_prefix":"\\u002f"', '"requests_pathname_prefix":".\\u002f"')
+    page = re.sub(r'(src|href)="/', r'\1="./', page)
+    page = page.replace('<script id="_dash-renderer"', '<script src="./export_static.js"></script>\n<script id="_dash-renderer"', 1)
+    write(bundle, "index.html", page.encode("utf-8"))
+    shutil.copy("export_static.js", os.path.join(bundle, "export_static.js"))
+
+
+def export_component_suites(client, bundle):
+    # every script the components may load (async chunks, plotly.js), under their plain and fingerprinted names
+    for package, paths in app.app.registered_paths.items():
+        scripts = {path: fetch(client, f"/_dash-component-suites/{package}/{path}") for path in sorted(paths) if not path.endswith(".map")}
+        fingerprints = {}
+        for path, body in scripts.items():
+            # the component bundles request their async chunks with the build's fingerprint inserted into the file name
+            fingerprints.setdefault(os.path.dirname(path), set()).update(re.findall(rb'splice\(1,0,"(v[0-9_]+m[0-9]+)"\)', body))
+        for path, body in scripts.items():
+            write(bundle, f"_dash-component-suites/{package}/{path}", body)
+            directory, name = os.path.split(path)
+            stem, _, extension = name.partition(".")
+            for fingerprint in fingerprints.get(directory, ()):
+                write(bundle, f"_dash-component-suites/{package}/{directory}/{stem}.{fingerprint.decode()}.{extension}", body)
+
+
+def export_assets(client, bundle):
+    for root, _, files in os.walk(app.app.config.assets_folder):
+        for name in files:
+            path = os.path.relpath(os.path.join(root, name), app.app.config.assets_folder).replace(os.sep, "/")
+            write(bundle, f"assets/{path}", fetch(client, f"/assets/{urllib.parse.quote(path)}"))
+
+
+def export_states(client, bundle, dependency):
+    # breadth-first over the clicks: every table data a response shows adds the clicks on its rows
+    outputs = [dict(zip(("id", "property"), output.rsplit(".", 1))) for output in dependency["output"].strip(".").split("...")]
+
+    def post(trigger, value, states):
+        inputs = [
+            {**dependency_input, "value": value if f'{dependency_input["id"]}.{dependency_input["property"]}' == trigger else None}
+            for dependency_input in dependency["inputs"]
+        ]
+        state = [{**dependency_state, "value": states.get(f'{dependency_state["id"]}.{dependency_state["property"]}')} for dependency_state in dependency["state"]]
+        body = {"output": dependency["output"], "outputs": outputs, "inputs": inputs, "state": state, "changedPropIds": [trigger]}
+        response = client.post("/_dash-update-component", json=body)
+        if response.status_code not in (200, 204):
+            raise RuntimeError(f"{trigger}: {response.status_code} {response.data[:200]!r}")
+        return json.loads(response.data)["response"] if response.status_code == 200 else None
+
+    props = layout_props(json.loads(fetch(client, "/_dash-layout")))
+    clicks = deque([("background", None, None, "background.n_clicks", 1, {})])
+    clicks.extend(("word-cloud", None, tool, "word-cloud.clickData", {"points": [{"text": tool}]}, {}) for tool in app.dataset().df_tools["Tool"])
+    seen_tables = set()
+
+    def add_table_clicks(table, records):
+        key = (table, json.dumps(records, sort_keys=True))
+        if key not in seen_tables:
+            seen_tables.add(key)
+            clicks.extend(
+                (table, row, record.get(table_columns[table]), f"{table}.active_cell", {"row": row, "column": 0}, {f"{table}.data": records})
+                for row, record in enumerate(records)
+            )
+
+    for table in table_columns:
+        add_table_clicks(table, props[table]["data"])
+
+    states = {}
+    while clicks:
+        trigger, row, value, trigger_prop, trigger_value, trigger_states = clicks.popleft()
+        key = json.dumps([trigger, row, value], separators=(",", ":"), ensure_ascii=False) # as JSON.stringify in export_static.js
+        if key in states:
+            continue
+        response = post(trigger_prop, trigger_value, trigger_states)
+        if response is None:
+            states[key] = None
+            continue
+        states[key] = len(states)
+        write(bundle, f"states/{states[key]}.json", json.dumps(response, separators=(",", ":")).encode("utf-8"))
+        for table in table_columns:
+            if "data" in response.get(table, {}):
+                add_table_clicks(table, response[table]["data"])
+
+    write(bundle, "states/index.json", json.dumps({"columns": table_columns, "states": states}, ensure_ascii=False).encode("utf-8"))
+    return len(states)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bundle", help="output directory (replaced)")
+    args = parser.parse_args()
+
+    shutil.rmtree(args.bundle, ignore_errors=True)
+    client = app.app.server.test_client()
+
+    export_page(client, args.bundle)
+    export_component_suites(client, args.bundle)
+    export_assets(client, args.bundle)
+    write(args.bundle, "_dash-layout", fetch(client, "/_dash-layout"))
+    for name in app.static_files: # the content-hashed files of the layout (header icons sprite, PDF)
+        url = f"/static-assets/{urllib.parse.quote(name)}"
+        write(args.bundle, url, fetch(client, url))
+
+    # the server callbacks (the crossfilter dispatcher) become the client-side dispatcher of export_static.js
+    dependencies = json.loads(fetch(client, "/_dash-dependencies"))
+    server_callbacks = [dependency for dependency in dependencies if dependency.get("clientside_function") is None]
+    if len(server_callbacks) != 1:
+        sys.exit(f"expected the crossfilter dispatcher as the only server callback, found {len(server_callbacks)}")
+    states_count = export_states(client, args.bundle, server_callbacks[0])
+    server_callbacks[0]["clientside_function"] = {"namespace": "static_export", "function_name": "dispatch"}
+    write(args.bundle, "_dash-dependencies", json.dumps(dependencies).encode("utf-8"))
+
+    print(f"exported {states_count} selection states to {args.bundle}")
+
+
+if __name__ == "__main__":
+    main()
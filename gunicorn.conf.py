@@ -0,0 +1,40 @@
+# Production settings for a prefork deployment:  gunicorn -c gunicorn.conf.py app:server
+# The app (data, relation index, figure cache, precomputed outputs) is built once in the master and shared copy-on-write
+# with the forked workers; app.py re-creates the per-process state (locks, metrics, log thread) after each fork.
+
+import gc
+import glob
+import multiprocessing
+import os
+import tempfile
+
+bind = os.environ.get("CV_BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("CV_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("CV_THREADS", 4))
+preload_app = True
+
+# the workers write their metrics to files of this directory, which /metrics adds up (set before the app is preloaded)
+os.environ.setdefault("CV_METRICS_DIR", tempfile.mkdtemp(prefix="cv-metrics-"))
+
+
+def on_starting(server):
+    # counters start from zero with every server start
+    os.makedirs(os.environ["CV_METRICS_DIR"], exist_ok=True)
+    for path in glob.glob(os.path.join(os.environ["CV_METRICS_DIR"], "worker-*.json*")):
+        os.remove(path)
+
+
+def when_ready(server):
+    import app
+
+    # move the preloaded objects out of the GC's generations, so that collections in the workers don't write to
+    # (and thereby copy) the shared pages
+    gc.collect()
+    gc.freeze()
+    server.log.info("master %s", app.memory_report())
+
+
+def post_worker_init(worker):
+    import app
+
+    worker.log.info("worker %s", app.memory_report())
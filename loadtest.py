@@ -0,0 +1,290 @@
+"""Load test: replays click sessions against the app as real Dash requests and reports throughput, latency and errors.
+
+    python loadtest.py                                         # in-process (Flask test client), 1 process x 1/2/4/8 threads
+    python loadtest.py --threads 4 --processes 1 2 4           # ... also forked worker processes (like the gunicorn workers)
+    python loadtest.py --url http://127.0.0.1:8050             # against a running server instead
+    python loadtest.py --save-sessions sessions.json           # save the (random) sessions, to replay them with --sessions
+
+A session loads the page (layout and dependencies, unless --no-page-load) and then clicks through the views, e.g. a project,
+a role, a word in the word cloud, a task of the filtered tasks, the background (reset), and so on. Every click is sent as the
+browser does it: the crossfilter callback request, then the chained requests of the other callbacks whose inputs the response
+changed (the page requests in the paging mode), until nothing is left to update. Like dash-renderer, a callback is not
+re-triggered by its own outputs (the active cells the crossfilter callback clears are among its inputs: no request). Chained
+requests are sent one after the other (the browser may send them in parallel).
+
+Reports per processes x threads: sessions, clicks and requests per second, click latency (the click's request and its chained
+requests) and request latency percentiles, the share of PreventUpdate (204) responses and the error rate.
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+import urllib.parse
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+os.chdir(os.path.dirname(os.path.abspath(__file__))) # app.py reads data/*.csv relative to the working directory
+os.environ.setdefault("CV_LOG_SAMPLE_RATE", "0")
+
+
+class TestClientTransport:
+    """Requests to the app in this process, through the Flask test client (one per thread)."""
+
+    def __init__(self):
+        import app # imported here, so that --url does not load the app
+        self.client = app.app.server.test_client()
+
+    def request(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.data
+
+
+class HttpTransport:
+    """Requests to a running server, over a keep-alive connection (one per thread)."""
+
+    def __init__(self, url):
+        parsed = urllib.parse.urlsplit(url)
+        self.prefix = parsed.path.rstrip("/")
+        self.connection = (http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection)(parsed.netloc, timeout=60)
+
+    def request(self, method, path, body=None):
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        self.connection.request(method, self.prefix + path, body=json.dumps(body) if body is not None else None, headers=headers)
+        response = self.connection.getresponse()
+        return response.status, response.read()
+
+
+def layout_props(layout):
+    # "id.property" -> value of every property of the components with an id, as the browser holds them
+    props = {}
+    stack = [layout]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if "props" in node and isinstance(node["props"].get("id"), str):
+                props.update({f'{node["props"]["id"]}.{name}': value for name, value in node["props"].items()})
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return props
+
+
+def random_session(props, clicks, rng):
+    # a click sequence, biased towards the flow projects -> roles -> word cloud -> tasks / achievements -> background
+    tools = [point for trace in props.get("word-cloud.figure", {}).get("data", []) for point in trace.get("text", [])]
+    session = []
+    for _ in range(clicks):
+        target = rng.choices(
+            ["projects-table", "roles-table", "word-cloud", "tasks-table", "achievements-table", "background"],
+            weights=[30, 20, 20, 12, 8, 10]
+        )[0]
+        if target == "word-cloud":
+            session.append({"target": target, "text": rng.choice(tools)})
+        elif target == "background":
+            session.append({"target": target})
+        else:
+            session.append({"target": target, "row": rng.random()}) # a share of the rows the table shows at the time of the click
+    return session
+
+
+class Session:
+    """The browser side of one page view: component properties, and the requests their changes trigger."""
+
+    def __init__(self, transport, page_load, initial):
+        self.transport = transport
+        self.timings = [] # (latency, status) of every request
+        if page_load:
+            for path in ("/", "/_dash-layout", "/_dash-dependencies"):
+                self.timed("GET", path)
+        self.dependencies, self.props = initial["dependencies"], dict(initial["props"])
+        self.props["page-view.data"] = uuid.uuid4().hex # as assets/coalesce.js sets it in the browser
+
+    def timed(self, method, path, body=None):
+        started = time.perf_counter()
+        try:
+            status, data = self.transport.request(method, path, body)
+        except Exception: # noqa: BLE001 - a failed request is counted as an error
+            status, data = None, b""
+        self.timings.append((time.perf_counter() - started, status))
+        return status, data
+
+    def call(self, dependency, changed):
+        outputs = [dict(zip(("id", "property"), output.rsplit(".", 1))) for output in dependency["output"].strip(".").split("...")]
+        body = {
+            "output": dependency["output"],
+            "outputs": outputs if dependency["output"].startswith("..") else outputs[0],
+            "inputs": [{**item, "value": self.props.get(f'{item["id"]}.{item["property"]}')} for item in dependency["inputs"]],
+            "state": [{**item, "value": self.props.get(f'{item["id"]}.{item["property"]}')} for item in dependency["state"]],
+            "changedPropIds": changed,
+        }
+        status, data = self.timed("POST", "/_dash-update-component", body)
+        if status != 200:
+            return []
+        updated = []
+        for component_id, properties in json.loads(data)["response"].items():
+            for name, value in properties.items():
+                self.props[f"{component_id}.{name}"] = value
+                updated.append(f"{component_id}.{name}")
+        return updated
+
+    def propagate(self, changed):
+        # send the server callbacks with an input among the changed properties, then those their responses trigger
+        pending = [(changed, False)]
+        while pending:
+            changed, chained = pending.pop(0)
+            for dependency in self.dependencies:
+                if dependency.get("clientside_function") is not None:
+                    continue
+                if chained and any(output in changed for output in dependency["output"].strip(".").split("...")):
+                    continue # circular: dash-renderer drops a callback triggered by a response that updated its outputs
+                triggered = [prop for prop in changed if prop in {f'{item["id"]}.{item["property"]}' for item in dependency["inputs"]}]
+                if triggered:
+                    updated = self.call(dependency, triggered)
+                    if updated:
+                        pending.append((updated, True))
+
+    def click(self, click):
+        target = click["target"]
+        if target == "background":
+            prop = "background.n_clicks"
+            self.props[prop] = (self.props.get(prop) or 0) + 1
+        elif target == "word-cloud":
+            prop = "word-cloud.clickData"
+            self.props[prop] = {"points": [{"curveNumber": 0, "text": click["text"]}]}
+        else:
+            rows = self.props.get(f"{target}.data") or []
+            if not rows:
+                return
+            row = min(int(click["row"] * len(rows)), len(rows) - 1)
+            prop = f"{target}.active_cell"
+            self.props[prop] = {"row": row, "column": 0}
+            self.props[f"{target}.selected_cells"] = [{"row": row, "column": 0}]
+        self.propagate([prop])
+
+
+def run_user(transport_factory, sessions, page_load, initial):
+    transport = transport_factory()
+    clicks = [] # (latency, statuses)
+    requests = []
+    for clicks_of_session in sessions:
+        session = Session(transport, page_load, initial)
+        for click in clicks_of_session:
+            first = len(session.timings)
+            started = time.perf_counter()
+            session.click(click)
+            clicks.append((time.perf_counter() - started, [status for _, status in session.timings[first:]]))
+        requests.extend(session.timings)
+    return clicks, requests
+
+
+def run_process(url, sessions_per_user, threads, page_load, initial):
+    transport_factory = (lambda: HttpTransport(url)) if url else TestClientTransport
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda user_sessions: run_user(transport_factory, user_sessions, page_load, initial), sessions_per_user))
+    return [click for clicks, _ in results for click in clicks], [request for _, requests in results for request in requests]
+
+
+def percentile(samples, q):
+    if not samples:
+        return float("nan")
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1] if len(samples) > 1 else samples[0]
+
+
+def load_test(url, sessions, processes, threads, page_load, initial):
+    # the sessions are shared round-robin between processes x threads virtual users
+    users = processes * threads
+    per_user = [sessions[user::users] for user in range(users)]
+    started = time.perf_counter()
+    if processes == 1:
+        clicks, requests = run_process(url, per_user, threads, page_load, initial)
+    else:
+        context = multiprocessing.get_context("fork") # the workers share the imported app, as with the gunicorn preload
+        with context.Pool(processes) as pool:
+            results = pool.starmap(run_process, [(url, per_user[process::processes], threads, page_load, initial) for process in range(processes)])
+        clicks = [click for process_clicks, _ in results for click in process_clicks]
+        requests = [request for _, process_requests in results for request in process_requests]
+    elapsed = time.perf_counter() - started
+
+    statuses = [status for _, status in requests]
+    errors = sum(1 for status in statuses if status not in (200, 204))
+    return {
+        "processes": processes,
+        "threads": threads,
+        "sessions": len(sessions),
+        "clicks": len(clicks),
+        "requests": len(requests),
+        "seconds": elapsed,
+        "clicks_per_s": len(clicks) / elapsed,
+        "requests_per_s": len(requests) / elapsed,
+        "click_p50_ms": percentile([latency for latency, _ in clicks], 50) * 1000,
+        "click_p95_ms": percentile([latency for latency, _ in clicks], 95) * 1000,
+        "click_p99_ms": percentile([latency for latency, _ in clicks], 99) * 1000,
+        "request_p50_ms": percentile([latency for latency, _ in requests], 50) * 1000,
+        "request_p95_ms": percentile([latency for latency, _ in requests], 95) * 1000,
+        "prevented_share": statuses.count(204) / len(statuses) if statuses else 0.0,
+        "error_rate": errors / len(statuses) if statuses else 0.0,
+    }
+
+
+def initial_state(url):
+    # the layout properties and the callback dependencies, as a freshly loaded page has them
+    transport = HttpTransport(url) if url else TestClientTransport()
+    _, layout = transport.request("GET", "/_dash-layout")
+    _, dependencies = transport.request("GET", "/_dash-dependencies")
+    return {"props": layout_props(json.loads(layout)), "dependencies": json.loads(dependencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server (default: the app in this process, via the Flask test client)")
+    parser.add_argument("--threads", type=int, nargs="*", default=[1, 2, 4, 8], help="virtual users (threads) per process (default 1 2 4 8)")
+    parser.add_argument("--processes", type=int, nargs="*", default=[1], help="processes (default 1)")
+    parser.add_argument("--sessions", metavar="PATH", help="replay the sessions saved in this JSON file instead of random ones")
+    parser.add_argument("--session-count", type=int, default=64, help="random sessions per run (default 64)")
+    parser.add_argument("--clicks", type=int, default=12, help="clicks per random session (default 12)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random sessions (default 0)")
+    parser.add_argument("--save-sessions", metavar="PATH", help="save the sessions as JSON, for --sessions")
+    parser.add_argument("--no-page-load", action="store_true", help="do not request the page, layout and dependencies at the start of a session")
+    parser.add_argument("--json", metavar="PATH", help="save the results as JSON")
+    args = parser.parse_args()
+
+    initial = initial_state(args.url)
+    if args.sessions:
+        with open(args.sessions) as f:
+            sessions = json.load(f)
+    else:
+        rng = random.Random(args.seed)
+        sessions = [random_session(initial["props"], args.clicks, rng) for _ in range(args.session_count)]
+    if args.save_sessions:
+        with open(args.save_sessions, "w") as f:
+            json.dump(sessions, f, indent=1)
+
+    if not any(dependency.get("clientside_function") is None for dependency in initial["dependencies"]):
+        sys.exit("the app has no server callbacks to load (CV_CLIENTSIDE=1?)")
+
+    results = []
+    print(f"{'procs':>5}{'threads':>8}{'clicks':>8}{'req':>8}{'clicks/s':>10}{'req/s':>9}{'click p50':>11}{'p95':>9}{'p99':>9}"
+          f"{'req p50':>9}{'p95':>9}{'204 %':>7}{'err %':>7}")
+    for processes in args.processes:
+        for threads in args.threads:
+            result = load_test(args.url, sessions, processes, threads, not args.no_page_load, initial)
+            results.append(result)
+            print(
+                f"{processes:>5}{threads:>8}{result['clicks']:>8}{result['requests']:>8}{result['clicks_per_s']:>10.1f}{result['requests_per_s']:>9.1f}"
+                f"{result['click_p50_ms']:>11.2f}{result['click_p95_ms']:>9.2f}{result['click_p99_ms']:>9.2f}"
+                f"{result['request_p50_ms']:>9.2f}{result['request_p95_ms']:>9.2f}{result['prevented_share'] * 100:>7.1f}{result['error_rate'] * 100:>7.2f}"
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
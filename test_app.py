@@ -0,0 +1,181 @@
+"""Tests of the crossfilter logic against the data in data/: compound selections, table paging / sorting, data validation.
+
+    python -m pytest -q
+"""
+
+import os
+import random
+from functools import reduce
+
+import pandas as pd
+import pytest
+
+os.chdir(os.path.dirname(os.path.abspath(__file__))) # app.py reads data/*.csv relative to the working directory
+os.environ.setdefault("CV_LOG_SAMPLE_RATE", "0")
+
+import app # noqa: E402
+
+
+data = app.dataset()
+
+
+def all_items():
+    return [(dimension, value) for dimension in app.dimensions for value in data.bitmap_values[dimension]]
+
+
+#########################################################################################################################################################
+################################################################## COMPOUND SELECTIONS ##################################################################
+#########################################################################################################################################################
+
+
+def naive_selected_values(operator, items, related_dimension):
+    # the values related to all / any of the items, by set operations over the relation lists, plus the selected items of that dimension
+    related_sets = [set(app.related(dimension, value, related_dimension)) for dimension, value in items]
+    values = reduce(set.intersection if operator == "and" else set.union, related_sets)
+    return values | {value for dimension, value in items if dimension == related_dimension}
+
+
+@pytest.mark.parametrize("operator", ["and", "or"])
+def test_compound_selection_matches_set_reference(operator):
+    rng = random.Random(42)
+    items = all_items()
+    for _ in range(500):
+        selection = app.Selection(operator, tuple(rng.sample(items, rng.randint(1, 4))))
+        for related_dimension in app.dimensions:
+            values = app.related("Selection", selection, related_dimension)
+            assert set(values) == naive_selected_values(operator, selection.items, related_dimension), (selection, related_dimension)
+            positions = [data.bitmap_positions[related_dimension][value] for value in values]
+            assert positions == sorted(positions) # table order
+
+
+def test_single_item_selection_is_the_plain_relation():
+    for dimension, value in all_items():
+        for related_dimension in app.dimensions:
+            if related_dimension == dimension:
+                continue
+            expected = set(app.related(dimension, value, related_dimension))
+            for operator in ["and", "or"]:
+                assert set(app.related("Selection", app.Selection(operator, ((dimension, value),)), related_dimension)) == expected
+
+
+def test_next_selection():
+    task, other_task = data.bitmap_values["Task"][:2]
+    role = data.bitmap_values["Role"][0]
+
+    selection = app.next_selection(None, None, "Task", task)
+    assert selection == {"operator": None, "items": [["Task", task]]}
+    assert app.next_selection(selection, "and", "Role", role) == {"operator": "and", "items": [["Task", task], ["Role", role]]}
+
+    selection = app.next_selection(app.next_selection(selection, "or", "Task", other_task), "or", "Task", task) # toggled off
+    assert selection == {"operator": "or", "items": [["Task", other_task]]}
+    assert app.next_selection(selection, "or", "Task", other_task) == selection # the last item stays selected
+    assert app.next_selection(selection, None, "Role", role) == {"operator": None, "items": [["Role", role]]} # a plain click
+
+
+#########################################################################################################################################################
+#################################################################### TABLE PAGING #######################################################################
+#########################################################################################################################################################
+
+
+def table_records(df_table):
+    # records comparable with ==, NaN included
+    return df_table.astype(object).where(df_table.notna(), "NaN").to_dict("records")
+
+
+@pytest.mark.parametrize("dimension", ["Task", "Achievement"])
+def test_table_pages_cover_the_rows_in_order(dimension):
+    df_table = {"Task": data.df_tasks, "Achievement": data.df_achievements}[dimension]
+    for page_size in [1, 3, 10, len(df_table) + 1]:
+        pages = []
+        page_count = None
+        for page_current in range(-(-len(df_table) // page_size)):
+            records, page_count = app.table_page(dimension, None, page_current, page_size, [])
+            assert 0 < len(records) <= page_size
+            pages += records
+        assert page_count == max(1, -(-len(df_table) // page_size))
+        assert table_records(pd.DataFrame(pages)) == table_records(df_table)
+
+
+@pytest.mark.parametrize("dimension", ["Task", "Achievement"])
+def test_table_sort_matches_a_stable_sort(dimension):
+    df_table = {"Task": data.df_tasks, "Achievement": data.df_achievements}[dimension]
+    rng = random.Random(7)
+    for rows in [None, sorted(rng.sample(range(len(df_table)), 9)), sorted(rng.sample(range(len(df_table)), 2))]:
+        df_rows = df_table if rows is None else df_table.iloc[rows]
+        for column in df_table.columns:
+            for direction in ["asc", "desc"]:
+                records, _ = app.table_page(dimension, rows, 0, len(df_table), [{"column_id": column, "direction": direction}])
+                # equal values in table order in both directions, missing values last (asc) / first (desc)
+                expected = df_rows.sort_values(column, ascending=direction == "asc", kind="stable", na_position="last" if direction == "asc" else "first")
+                assert table_records(pd.DataFrame(records, columns=df_table.columns)) == table_records(expected), (rows, column, direction)
+
+
+def test_table_sort_ties_keep_table_order():
+    priorities = data.df_tasks["Task_Priority"]
+    assert priorities.duplicated().any() # the data has ties to check
+    records, _ = app.table_page("Task", None, 0, len(priorities), [{"column_id": "Task_Priority", "direction": "desc"}])
+    for priority in priorities[priorities.duplicated()].unique():
+        assert [record["Task"] for record in records if record["Task_Priority"] == priority] == data.df_tasks.loc[priorities == priority, "Task"].tolist()
+
+
+#########################################################################################################################################################
+################################################################### DATA VALIDATION #####################################################################
+#########################################################################################################################################################
+
+
+def changed_dataset(**tables):
+    # a copy of the current snapshot with some tables replaced (same version, so that it passes the data/*.csv hash check)
+    return app.Dataset(**{**vars(data), "precomputed_outputs": {}, "rendered": {}, **tables})
+
+
+def fact_table_with(row, column, value):
+    df = app.decoded(data.df)
+    df.loc[df.index[row], column] = value
+    return df
+
+
+def test_validate_dataset_accepts_the_data_without_touching_the_figure_cache():
+    stats = app.figure_cache.stats()
+    app.validate_dataset(changed_dataset())
+    assert app.figure_cache.stats() == stats
+
+
+def test_validate_dataset_rejects_changed_files():
+    with pytest.raises(ValueError, match="changed while loading"):
+        app.validate_dataset(changed_dataset(version="0" * 64))
+
+
+def test_validate_dataset_rejects_an_empty_table():
+    with pytest.raises(ValueError, match="df_tasks is empty"):
+        app.validate_dataset(changed_dataset(df_tasks=data.df_tasks.iloc[:0]))
+
+
+def test_validate_dataset_rejects_duplicate_client_orders():
+    with pytest.raises(ValueError, match="Client_Order is not unique"):
+        app.validate_dataset(changed_dataset(df_clients=pd.concat([data.df_clients, data.df_clients.iloc[:1]])))
+
+
+def test_validate_dataset_names_a_tool_with_two_tool_types():
+    tool = app.decoded(data.df)["Tool"].iloc[0]
+    with pytest.raises(ValueError, match=f"tool '{tool}' has more than one Tool_Type in data/data.csv"):
+        app.validate_dataset(changed_dataset(df=fact_table_with(0, "Tool_Type", "bogus")))
+
+
+def test_validate_dataset_names_a_tool_with_two_tool_sizes():
+    tool = app.decoded(data.df)["Tool"].iloc[0]
+    with pytest.raises(ValueError, match=f"tool '{tool}' has more than one Tool_Size in data/data.csv"):
+        app.validate_dataset(changed_dataset(df=fact_table_with(0, "Tool_Size", 99)))
+
+
+def test_validate_dataset_names_a_tool_with_an_unknown_tool_type():
+    df = app.decoded(data.df)
+    tool = df["Tool"].iloc[0]
+    df.loc[df["Tool"] == tool, "Tool_Type"] = "bogus"
+    with pytest.raises(ValueError, match=f"tool '{tool}' has an unknown Tool_Type 'bogus' in data/data.csv"):
+        app.validate_dataset(changed_dataset(df=df))
+
+
+def test_validate_dataset_names_a_tool_with_two_word_cloud_positions():
+    tool = data.df_tools["Tool"].iloc[0]
+    with pytest.raises(ValueError, match=f"tool '{tool}' has more than one word cloud position in data/word_cloud_coordinates.csv"):
+        app.validate_dataset(changed_dataset(df_tools=pd.concat([data.df_tools, data.df_tools.iloc[:1]])))